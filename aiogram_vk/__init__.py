@@ -1,17 +1,35 @@
 import asyncio as _asyncio
 from contextlib import suppress
+from importlib import import_module as _import_module
+from typing import Any as _Any
 
-from . import enums, methods, types
+from . import methods, types
 from .__meta__ import __api_version__, __version__
 from .client import session
 from .client.bot import VkBot
-from .client.token_provider import VkTokenProvider
 
 with suppress(ImportError):
     import uvloop as _uvloop  # type: ignore
 
     _asyncio.set_event_loop_policy(_uvloop.EventLoopPolicy())
 
+# Non-essential submodules are imported on the first access to keep startup fast
+_LAZY_ATTRIBUTES = {
+    "enums": (".enums", None),
+    "Dispatcher": (".dispatcher", "Dispatcher"),
+    "VkTokenProvider": (".client.token_provider", "VkTokenProvider"),
+}
+
+
+def __getattr__(name: str) -> _Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    module = _import_module(module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
 
 __all__ = (
     "__api_version__",
@@ -20,6 +38,7 @@ __all__ = (
     "methods",
     "enums",
     "VkBot",
+    "Dispatcher",
     "session",
     "VkTokenProvider",
 )
@@ -20,12 +20,14 @@ from typing import (
 import aiofiles
 
 from aiogram_vk.__meta__ import __api_version__
-from aiogram_vk.methods import account
-from aiogram_vk.types import AccountUserSettings
+from aiogram_vk.methods import account, audio
+from aiogram_vk.types import AccountUserSettings, Audio, AudioUploadResult
+from aiogram_vk.utils.timeouts import TimeoutType
 from aiogram_vk.utils.token import extract_bot_id, validate_token
 
 from ..methods import VkMethod
 from ..types import AccountInfo
+from ..types.input_file import InputFile
 from .default import DefaultBotProperties
 from .session.aiohttp import AiohttpSession
 from .session.base import BaseSession
@@ -192,7 +194,70 @@ class VkBot:
             if close_stream:
                 await stream.aclose()
 
-    async def __call__(self, method: VkMethod[T], request_timeout: Optional[int] = None) -> T:
+    async def upload_audio(
+        self,
+        file: InputFile,
+        artist: Optional[str] = None,
+        title: Optional[str] = None,
+        request_timeout: Optional[TimeoutType] = None,
+    ) -> Audio:
+        """
+        Upload audio file using the Vk two-step upload flow:
+        request upload URL, stream the file to it and save the result.
+
+        File content is piped straight into the request body,
+        so :class:`URLInputFile` is proxied from source to Vk without local buffering.
+
+        :param file: File to upload
+        :param artist: Artist name, by default taken from ID3 tags
+        :param title: Title, by default taken from ID3 tags
+        :param request_timeout: Upload request timeout
+        :return: Saved audio
+        """
+        get_upload_server = audio.GetUploadServer()
+        upload_server = await self(get_upload_server)
+        raw_result = await self.session.upload_file(
+            self,
+            method=get_upload_server,
+            url=upload_server.upload_url,
+            files={"file": file},
+            timeout=request_timeout,
+        )
+        result = AudioUploadResult.model_validate(raw_result, context={"bot": self})
+        return await self(
+            audio.Save(
+                server=result.server,
+                audio=result.audio,
+                hash=result.hash,
+                artist=artist,
+                title=title,
+            )
+        )
+
+    def stream_items(
+        self, method: VkMethod[Any], request_timeout: Optional[TimeoutType] = None
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Call API method and iterate over items of the response
+        as soon as they are received.
+
+        Lowers peak memory for large responses, for example :code:`audio.get`
+        with thousands of items.
+
+        .. code-block:: python
+
+            async for track in bot.stream_items(audio.Get(owner_id=owner_id)):
+                ...
+
+        :param method: Method with items streaming support
+        :param request_timeout: Request timeout
+        :return: async iterator over items
+        """
+        return self.session.stream_items(self, method, timeout=request_timeout)
+
+    async def __call__(
+        self, method: VkMethod[T], request_timeout: Optional[TimeoutType] = None
+    ) -> T:
         """
         Call API method
 
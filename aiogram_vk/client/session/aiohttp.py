@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import ssl
+from http import HTTPStatus
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -17,16 +18,30 @@ from typing import (
 )
 
 import certifi
-from aiohttp import BasicAuth, ClientError, ClientSession, FormData, TCPConnector
-from aiohttp.hdrs import USER_AGENT
+from aiohttp import (
+    BaseConnector,
+    BasicAuth,
+    ClientError,
+    ClientResponse,
+    ClientSession,
+    ClientTimeout,
+    FormData,
+    TCPConnector,
+)
+from aiohttp.compression_utils import BrotliDecompressor, ZLibDecompressor
+from aiohttp.hdrs import CONTENT_ENCODING, USER_AGENT
+from aiohttp.payload import AsyncIterablePayload
 
 from aiogram_vk.__meta__ import __version__
 from aiogram_vk.methods import VkMethod
 
-from ...exceptions import VkNetworkError
+from ...exceptions import ClientDecodeError, VkAPIError, VkNetworkError
 from ...methods.base import VkType
 from ...types import InputFile
-from .base import BaseSession
+from ...utils.compression import TransferStats
+from ...utils.stage_timer import mark_stage
+from ...utils.timeouts import RequestTimeout, TimeoutType, remaining_time
+from .base import DEFAULT_TIMEOUT, BaseSession
 
 if TYPE_CHECKING:
     from ..bot import VkBot
@@ -84,6 +99,63 @@ def _prepare_connector(chain_or_plain: _ProxyType) -> Tuple[Type["TCPConnector"]
     return ChainProxyConnector, {"proxy_infos": infos}
 
 
+def _connector_stats(connector: Optional[BaseConnector]) -> Optional[Dict[str, Any]]:
+    if connector is None or connector.closed:
+        return None
+    # Connector doesn't expose its connections, unknown values are None
+    idle = getattr(connector, "_conns", None)
+    acquired = getattr(connector, "_acquired", None)
+    waiters = getattr(connector, "_waiters", None)
+    return {
+        "limit": connector.limit,
+        "limit_per_host": connector.limit_per_host,
+        "acquired": None if acquired is None else len(acquired),
+        "idle": None if idle is None else sum(len(conns) for conns in idle.values()),
+        "queued": None if waiters is None else sum(len(queue) for queue in waiters.values()),
+    }
+
+
+def _has_ssl_connections(connector: Optional[BaseConnector]) -> bool:
+    if connector is None or connector.closed:
+        return False
+    idle = getattr(connector, "_conns", None)
+    acquired = getattr(connector, "_acquired_per_host", None)
+    if idle is None or acquired is None:
+        # Connector doesn't expose its connections, assume the worst
+        return True
+    return any(key.is_ssl and conns for key, conns in (*idle.items(), *acquired.items()))
+
+
+_ENCODINGS = frozenset({"gzip", "x-gzip", "deflate", "br"})
+
+
+def _body_decompressor(encoding: str, first_chunk: bytes) -> Any:
+    if encoding == "br":
+        # aiohttp advertises brotli only when it is installed
+        return BrotliDecompressor()
+    if encoding == "deflate":
+        # Some servers send raw deflate stream without zlib header
+        return ZLibDecompressor(
+            encoding="deflate", suppress_deflate_header=first_chunk[0] & 0xF != 8
+        )
+    return ZLibDecompressor(encoding="gzip")
+
+
+class InputFilePayload(AsyncIterablePayload):
+    """
+    Streams :class:`InputFile` chunks into the request body.
+
+    Chunks are written one by one and each write waits for the transport to drain,
+    so the file is never buffered in memory as a whole.
+    When the file size is known in advance the request is sent with
+    explicit content length instead of chunked transfer encoding.
+    """
+
+    def __init__(self, value: InputFile, bot: VkBot, **kwargs: Any) -> None:
+        super().__init__(value.read(bot), filename=value.filename, **kwargs)
+        self._size = value.size()
+
+
 class AiohttpSession(BaseSession):
     def __init__(self, proxy: Optional[_ProxyType] = None, **kwargs: Any) -> None:
         super().__init__(**kwargs)
@@ -95,6 +167,9 @@ class AiohttpSession(BaseSession):
         }
         self._should_reset_connector = True  # flag determines connector state
         self._proxy: Optional[_ProxyType] = None
+        self._transfer: Dict[str, TransferStats] = {}
+        self._downloads = 0
+        self._uploads = 0
 
         if proxy is not None:
             try:
@@ -120,26 +195,115 @@ class AiohttpSession(BaseSession):
 
     async def create_session(self) -> ClientSession:
         if self._should_reset_connector:
-            await self.close()
+            await self._close_session()
 
         if self._session is None or self._session.closed:
             self._session = ClientSession(
                 connector=self._connector_type(**self._connector_init),
-                headers={
-                    USER_AGENT: self.api.user_agent,
-                },
+                headers={USER_AGENT: self.api.user_agent},
             )
             self._should_reset_connector = False
 
         return self._session
 
     async def close(self) -> None:
+        await self.stop_loop_monitor()
+        await self._close_session()
+
+    async def _close_session(self) -> None:
         if self._session is not None and not self._session.closed:
+            has_ssl = _has_ssl_connections(self._session.connector)
             await self._session.close()
 
-            # Wait 250 ms for the underlying SSL connections to close
-            # https://docs.aiohttp.org/en/stable/client_advanced.html#graceful-shutdown
-            await asyncio.sleep(0.25)
+            # Only SSL connections still held by the connector need time to shut down
+            if has_ssl:
+                # Wait 250 ms for the underlying SSL connections to close
+                # https://docs.aiohttp.org/en/stable/client_advanced.html#graceful-shutdown
+                await asyncio.sleep(0.25)
+
+    async def iter_body(
+        self, resp: ClientResponse, key: str, chunk_size: int = 65536
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Read and decompress response body chunk by chunk and count its size
+        on the network and after decompression.
+
+        The response should be requested with :code:`auto_decompress=False`,
+        the body is decompressed with the decompressors of aiohttp.
+
+        :param resp: response
+        :param key: name of the transfer statistics, API method name for API requests
+        :param chunk_size: size of chunks read from the network
+        :raise ClientDecodeError: when the body can't be decompressed
+        """
+        stats = self._transfer.get(key)
+        if stats is None:
+            stats = self._transfer[key] = TransferStats()
+        stats.responses += 1
+        encoding = resp.headers.get(CONTENT_ENCODING, "identity").strip().lower()
+        decompressor: Any = None
+        compressed = uncompressed = 0
+        async for chunk in resp.content.iter_chunked(chunk_size):
+            compressed += len(chunk)
+            if encoding in _ENCODINGS:
+                try:
+                    if decompressor is None:
+                        decompressor = _body_decompressor(encoding, chunk)
+                    chunk = decompressor.decompress_sync(chunk)
+                except Exception as e:
+                    raise ClientDecodeError("Failed to decompress response body", e, None)
+            if chunk:
+                uncompressed += len(chunk)
+                yield chunk
+        if decompressor is not None:
+            try:
+                chunk = decompressor.flush()
+            except Exception as e:
+                raise ClientDecodeError("Failed to decompress response body", e, None)
+            if chunk:
+                uncompressed += len(chunk)
+                yield chunk
+        stats.add(compressed, uncompressed)
+
+    async def read_text(self, resp: ClientResponse, key: str) -> str:
+        """
+        Read whole response body
+
+        :param resp: response
+        :param key: name of the transfer statistics, API method name for API requests
+        :raise ClientDecodeError: when the body is not a valid text in its charset
+        """
+        body = b"".join([chunk async for chunk in self.iter_body(resp, key)])
+        try:
+            return body.decode(resp.charset or "utf-8")
+        except (UnicodeDecodeError, LookupError) as e:
+            raise ClientDecodeError("Failed to decode response body", e, body)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Also includes :code:`transfer` - sizes of the received bodies by API method
+        (downloads are counted as :code:`content`),
+        :code:`connector` - connections in use (:code:`acquired`), kept alive (:code:`idle`)
+        and requests waiting for a connection (:code:`queued`), None until the session is created,
+        :code:`downloads` and :code:`uploads` - files being transferred.
+        Download is counted while its response is open,
+        a stream abandoned without :code:`aclose()` stays counted
+        until it is garbage collected, use :func:`contextlib.aclosing` when breaking the loop
+        """
+        metrics = super().metrics()
+        metrics["transfer"] = {key: stats.as_dict() for key, stats in self._transfer.items()}
+        metrics["connector"] = _connector_stats(
+            None if self._session is None else self._session.connector
+        )
+        metrics["downloads"] = self._downloads
+        metrics["uploads"] = self._uploads
+        return metrics
+
+    @staticmethod
+    def client_timeout(timeout: RequestTimeout) -> ClientTimeout:
+        return ClientTimeout(
+            total=timeout.total, connect=timeout.connect, sock_read=timeout.sock_read
+        )
 
     def build_form_data(self, bot: VkBot, method: VkMethod[VkType]) -> FormData:
         form = FormData(quote_fields=False)
@@ -154,33 +318,121 @@ class AiohttpSession(BaseSession):
         for key, value in files.items():
             form.add_field(
                 key,
-                value.read(bot),
+                InputFilePayload(value, bot),
                 filename=value.filename or key,
             )
         return form
 
     async def make_request(
-        self, bot: VkBot, method: VkMethod[VkType], timeout: Optional[int] = None
+        self, bot: VkBot, method: VkMethod[VkType], timeout: Optional[TimeoutType] = None
     ) -> VkType:
+        mark_stage("middlewares")
         session = await self.create_session()
 
         url = self.api.api_url(token=bot.token, method=method.__api_method__)
         form = self.build_form_data(bot=bot, method=method)
+        request_timeout = self.resolve_timeout(method, timeout)
+        mark_stage("prepare")
 
         try:
             async with session.post(
-                url, data=form, timeout=self.timeout if timeout is None else timeout
+                url,
+                data=form,
+                timeout=self.client_timeout(request_timeout),
+                auto_decompress=False,
             ) as resp:
-                raw_result = await resp.text()
+                raw_result = await self.read_text(resp, method.__api_method__)
         except asyncio.TimeoutError:
             raise VkNetworkError(method=method, message="Request timeout error")
         except ClientError as e:
             raise VkNetworkError(method=method, message=f"{type(e).__name__}: {e}")
-        response = self.check_response(
+        finally:
+            mark_stage("network")
+        response = await self.decode_response(
             bot=bot, method=method, status_code=resp.status, content=raw_result
         )
+        mark_stage("decode")
         return cast(VkType, response.response)
 
+    async def stream_response(
+        self,
+        bot: VkBot,
+        method: VkMethod[VkType],
+        timeout: Optional[TimeoutType] = None,
+        chunk_size: int = 65536,
+    ) -> AsyncGenerator[bytes, None]:
+        session = await self.create_session()
+
+        url = self.api.api_url(token=bot.token, method=method.__api_method__)
+        form = self.build_form_data(bot=bot, method=method)
+        request_timeout = self.resolve_timeout(method, timeout)
+
+        try:
+            async with session.post(
+                url,
+                data=form,
+                timeout=self.client_timeout(request_timeout),
+                auto_decompress=False,
+            ) as resp:
+                if not HTTPStatus.OK <= resp.status <= HTTPStatus.IM_USED:
+                    raw_result = await self.read_text(resp, method.__api_method__)
+                    self.check_response(
+                        bot=bot, method=method, status_code=resp.status, content=raw_result
+                    )
+                async for chunk in self.iter_body(resp, method.__api_method__, chunk_size):
+                    yield chunk
+        except asyncio.TimeoutError:
+            raise VkNetworkError(method=method, message="Request timeout error")
+        except ClientError as e:
+            raise VkNetworkError(method=method, message=f"{type(e).__name__}: {e}")
+
+    async def upload_file(
+        self,
+        bot: VkBot,
+        method: VkMethod[Any],
+        url: str,
+        files: Dict[str, InputFile],
+        timeout: Optional[TimeoutType] = None,
+    ) -> Any:
+        session = await self.create_session()
+        # Default timeout of the method is for the upload server request, not for the upload
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT if self.timeout is None else self.timeout
+        request_timeout = self.resolve_timeout(method, timeout)
+
+        form = FormData(quote_fields=False)
+        for key, value in files.items():
+            form.add_field(
+                key,
+                InputFilePayload(value, bot),
+                filename=value.filename or key,
+            )
+
+        self._uploads += 1
+        try:
+            async with session.post(
+                url,
+                data=form,
+                timeout=self.client_timeout(request_timeout),
+                auto_decompress=False,
+            ) as resp:
+                raw_result = await self.read_text(resp, "upload")
+        except asyncio.TimeoutError:
+            raise VkNetworkError(method=method, message="Upload timeout error")
+        except ClientError as e:
+            raise VkNetworkError(method=method, message=f"{type(e).__name__}: {e}")
+        finally:
+            self._uploads -= 1
+
+        try:
+            json_data = self.json_loads(raw_result)
+        except Exception as e:
+            raise ClientDecodeError("Failed to decode upload response", e, raw_result)
+
+        if isinstance(json_data, dict) and "error" in json_data:
+            raise VkAPIError(method=method, message=str(json_data["error"]))
+        return json_data
+
     async def stream_content(
         self,
         url: str,
@@ -192,13 +444,28 @@ class AiohttpSession(BaseSession):
         if headers is None:
             headers = {}
 
+        total: float = timeout
+        remaining = remaining_time()
+        if remaining is not None:
+            if remaining <= 0:
+                raise asyncio.TimeoutError("Request deadline exceeded")
+            total = min(total, remaining)
+
         session = await self.create_session()
 
         async with session.get(
-            url, timeout=timeout, headers=headers, raise_for_status=raise_for_status
+            url,
+            timeout=ClientTimeout(total=total),
+            headers=headers,
+            raise_for_status=raise_for_status,
+            auto_decompress=False,
         ) as resp:
-            async for chunk in resp.content.iter_chunked(chunk_size):
-                yield chunk
+            self._downloads += 1
+            try:
+                async for chunk in self.iter_body(resp, "content", chunk_size):
+                    yield chunk
+            finally:
+                self._downloads -= 1
 
     async def __aenter__(self) -> AiohttpSession:
         await self.create_session()
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import contextvars
+import copy
 import datetime
 import json
 import secrets
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
 from enum import Enum
+from functools import lru_cache, partial
 from http import HTTPStatus
 from types import TracebackType
 from typing import (
@@ -14,18 +20,32 @@ from typing import (
     Callable,
     Dict,
     Final,
+    Iterator,
+    List,
+    NamedTuple,
     Optional,
+    Tuple,
     Type,
     cast,
 )
 
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
-from aiogram_vk.exceptions import ClientDecodeError, VkAPIError, VkRetryAfter
+from aiogram_vk.exceptions import (
+    ClientDecodeError,
+    VkAPIError,
+    VkNetworkError,
+    VkRetryAfter,
+)
+from aiogram_vk.utils.json_stream import JsonItemsParser
+from aiogram_vk.utils.loop_monitor import LoopMonitor
+from aiogram_vk.utils.timeouts import RequestTimeout, TimeoutType, remaining_time
+from aiogram_vk.utils.token import token_label
 
-from ...methods import Response, VkMethod
+from ...methods import Response, VkMethod, get_response_type
 from ...methods.base import VkType
 from ...types import InputFile, VkObject
+from ..context_controller import BotContextController
 from ..default import Default
 from ..vk import KATE, VkAPIClient
 from .middlewares.manager import RequestMiddlewareManager
@@ -39,6 +59,171 @@ _JsonDumps = Callable[..., str]
 DEFAULT_TIMEOUT: Final[float] = 60.0
 
 
+class _Packed(tuple):  # type: ignore[type-arg]
+    """
+    Model packed by the worker process: class, set fields with plain values,
+    set fields with nested models and extra fields
+    """
+
+    __slots__ = ()
+
+
+def _is_nested(value: Any) -> bool:
+    return isinstance(value, (BaseModel, list, dict))
+
+
+def _pack(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        plain = {}
+        nested = {}
+        for name in value.model_fields_set:
+            item = getattr(value, name)
+            if _is_nested(item):
+                nested[name] = _pack(item)
+            else:
+                plain[name] = item
+        return _Packed((type(value), plain, nested or None, value.model_extra or None))
+    if isinstance(value, list):
+        return [_pack(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _pack(item) for key, item in value.items()}
+    return value
+
+
+# Defaults of these types are shared between the models, others are copied for every model
+_IMMUTABLE_DEFAULTS = (type(None), bool, int, float, str, bytes, Enum)
+
+# State of the model as it is pickled, see :meth:`pydantic.BaseModel.__getstate__`
+_MODEL_STATE = frozenset(
+    {"__dict__", "__pydantic_extra__", "__pydantic_fields_set__", "__pydantic_private__"}
+)
+
+
+class _ModelDefaults(NamedTuple):
+    values: Dict[str, Any]
+    factories: Tuple[Tuple[str, Callable[[], Any]], ...]
+    private: Dict[str, Any]
+    bindable: bool
+    allows_extra: bool
+    restorable: bool
+
+
+@lru_cache(maxsize=None)
+def _model_defaults(model_type: Type[BaseModel]) -> _ModelDefaults:
+    values: Dict[str, Any] = {}
+    factories: List[Tuple[str, Callable[[], Any]]] = []
+    for name, field in model_type.model_fields.items():
+        if field.is_required():
+            # Always set by the worker
+            continue
+        if field.default_factory is not None:
+            factories.append((name, field.default_factory))
+        elif isinstance(field.default, _IMMUTABLE_DEFAULTS):
+            values[name] = field.default
+        else:
+            factories.append((name, partial(copy.deepcopy, field.default)))
+    return _ModelDefaults(
+        values=values,
+        factories=tuple(factories),
+        private={
+            name: attr.get_default() for name, attr in model_type.__private_attributes__.items()
+        },
+        bindable=issubclass(model_type, BotContextController),
+        allows_extra=model_type.model_config.get("extra") == "allow",
+        # Pickled state layout is private to pydantic, models are built with
+        # model_construct (much slower) if it has changed
+        restorable=set(model_type.model_construct().__getstate__()) == _MODEL_STATE,
+    )
+
+
+def _unpack(value: Any, bot: VkBot) -> Any:
+    if isinstance(value, _Packed):
+        model_type, plain, nested, extra = value
+        defaults = _model_defaults(model_type)
+        if not defaults.restorable:
+            return _construct(model_type, plain, nested, extra, bot)
+        values = defaults.values.copy()
+        for name, factory in defaults.factories:
+            values[name] = factory()
+        values.update(plain)
+        fields_set = set(plain)
+        if nested is not None:
+            for name, item in nested.items():
+                values[name] = _unpack(item, bot)
+            fields_set.update(nested)
+        private = defaults.private
+        if defaults.bindable:
+            private = {**private, "_bot": bot}
+        model = model_type.__new__(model_type)
+        # Models are restored the same way as unpickled ones, they were validated by the worker
+        model.__setstate__(
+            {
+                "__dict__": values,
+                "__pydantic_extra__": extra if defaults.allows_extra else None,
+                "__pydantic_fields_set__": fields_set,
+                "__pydantic_private__": private or None,
+            }
+        )
+        return model
+    if isinstance(value, list):
+        return [_unpack(item, bot) for item in value]
+    if isinstance(value, dict):
+        return {key: _unpack(item, bot) for key, item in value.items()}
+    return value
+
+
+def _construct(
+    model_type: Type[BaseModel],
+    plain: Dict[str, Any],
+    nested: Optional[Dict[str, Any]],
+    extra: Optional[Dict[str, Any]],
+    bot: VkBot,
+) -> BaseModel:
+    values = dict(plain)
+    if nested is not None:
+        for name, item in nested.items():
+            values[name] = _unpack(item, bot)
+    fields_set = set(values)
+    if extra is not None:
+        values.update(extra)
+    model = model_type.model_construct(_fields_set=fields_set, **values)
+    if isinstance(model, BotContextController):
+        model.as_(bot)
+    return model
+
+
+def _decode_response(json_loads: _JsonLoads, returning: Any, content: str) -> Optional[Any]:
+    """
+    Decode and validate response in the worker process.
+
+    Returns validated result packed with only the fields present in the response,
+    so much less data is pickled back than with the models themselves.
+    Returns None when response can't be decoded or contains an error,
+    in this case it is decoded again by the main process to raise the error with the full context.
+    """
+    try:
+        json_data = json_loads(content)
+        response = get_response_type(returning).model_validate(json_data)
+    except Exception:
+        return None
+    if response.error is not None:
+        return None
+    return _pack(response.response)
+
+
+def _exceeds_size(content: str, threshold: int) -> bool:
+    """
+    Check whether UTF-8 encoded content is at least threshold bytes long,
+    content is encoded only when the number of characters doesn't answer it
+    """
+    length = len(content)
+    if length >= threshold:
+        return True
+    if content.isascii() or length * 4 < threshold:
+        return False
+    return len(content.encode()) >= threshold
+
+
 class BaseSession(abc.ABC):
     """
     This is base class for all HTTP sessions in aiogram.
@@ -51,22 +236,76 @@ class BaseSession(abc.ABC):
         api: VkAPIClient = KATE,
         json_loads: _JsonLoads = json.loads,
         json_dumps: _JsonDumps = json.dumps,
-        timeout: float = DEFAULT_TIMEOUT,
+        timeout: Optional[TimeoutType] = None,
+        decode_executor: Optional[Executor] = None,
+        decode_offload_threshold: Optional[int] = None,
+        loop_monitor_interval: Optional[float] = None,
     ) -> None:
         """
 
         :param api: Vk Bot API URL patterns
         :param json_loads: JSON loader
         :param json_dumps: JSON dumper
-        :param timeout: Session scope request timeout
+        :param timeout: Session scope request timeout,
+            number of seconds or :class:`aiogram_vk.utils.timeouts.RequestTimeout`.
+            When not set, default timeout of the method is used
+            and :code:`DEFAULT_TIMEOUT` for methods without one
+        :param decode_executor: Executor for decoding of large responses,
+            by default the event loop's default executor is used.
+            With :class:`concurrent.futures.ProcessPoolExecutor`
+            :code:`json_loads` must be picklable, validated models are sent back
+            with only the fields present in the response and rebuilt without validation
+        :param decode_offload_threshold: Size of the response body in bytes
+            starting from which it is decoded and validated in the executor
+            instead of the event loop, offloading is disabled when None
+        :param loop_monitor_interval: Interval of the event loop lag measurements
+            in seconds, the monitor starts with the first call and is stopped by :meth:`close`,
+            disabled when None
         """
         self.api = api
         self.json_loads = json_loads
         self.json_dumps = json_dumps
         self.timeout = timeout
+        self.decode_executor = decode_executor
+        self.decode_offload_threshold = decode_offload_threshold
 
         self.middleware = RequestMiddlewareManager()
 
+        self._in_flight = 0
+        self._calls = 0
+        self._errors = 0
+        self._pending: Dict[str, int] = {}
+        self.loop_monitor: Optional[LoopMonitor] = None
+        if loop_monitor_interval is not None:
+            self.loop_monitor = LoopMonitor(interval=loop_monitor_interval)
+        self._draining = False
+        self._drained: Optional[asyncio.Event] = None
+
+    def resolve_timeout(
+        self, method: VkMethod[Any], timeout: Optional[TimeoutType] = None
+    ) -> RequestTimeout:
+        """
+        Resolve timeout of the request: explicit timeout, session timeout,
+        default timeout of the method when session timeout is not set
+        or :code:`DEFAULT_TIMEOUT`, reduced to the time left until the current
+        :func:`aiogram_vk.utils.timeouts.deadline`
+
+        :param method: Method instance
+        :param timeout: Explicit timeout of the request
+        :return: timeout
+        :raise VkNetworkError: when the deadline is exceeded
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is None:
+            timeout = method.get_timeout()
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise VkNetworkError(method=method, message="Request deadline exceeded")
+        return RequestTimeout.of(timeout).cap(remaining)
+
     def check_response(
         self, bot: VkBot, method: VkMethod[VkType], status_code: int, content: str
     ) -> Response[VkType]:
@@ -82,7 +321,7 @@ class BaseSession(abc.ABC):
             raise ClientDecodeError("Failed to decode object", e, content)
 
         try:
-            response_type = Response[method.__returning__]  # type: ignore
+            response_type = get_response_type(method.__returning__)
             response = response_type.model_validate(json_data, context={"bot": bot})
         except ValidationError as e:
             raise ClientDecodeError("Failed to deserialize object", e, json_data)
@@ -91,10 +330,52 @@ class BaseSession(abc.ABC):
             return response
 
         error_msg = cast(str, response.error.error_msg) if response.error else ""
+        error_code = response.error.error_code if response.error else None
 
         raise VkAPIError(
             method=method,
             message=error_msg,
+            error_code=error_code,
+        )
+
+    async def decode_response(
+        self, bot: VkBot, method: VkMethod[VkType], status_code: int, content: str
+    ) -> Response[VkType]:
+        """
+        Check response, large responses are decoded and validated in the executor
+        to keep the event loop responsive
+        """
+        threshold = self.decode_offload_threshold
+        if threshold is None or not _exceeds_size(content, threshold):
+            return self.check_response(
+                bot=bot, method=method, status_code=status_code, content=content
+            )
+
+        loop = asyncio.get_running_loop()
+        if not isinstance(self.decode_executor, ProcessPoolExecutor):
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(
+                self.decode_executor,
+                lambda: context.run(
+                    self.check_response,
+                    bot=bot,
+                    method=method,
+                    status_code=status_code,
+                    content=content,
+                ),
+            )
+
+        decoded = await loop.run_in_executor(
+            self.decode_executor, _decode_response, self.json_loads, method.__returning__, content
+        )
+        if decoded is not None and HTTPStatus.OK <= status_code <= HTTPStatus.IM_USED:
+            response_type = get_response_type(method.__returning__)
+            return cast(
+                Response[VkType], response_type.model_construct(response=_unpack(decoded, bot))
+            )
+        # Errors are rare, so they are raised from the event loop with the full context
+        return self.check_response(
+            bot=bot, method=method, status_code=status_code, content=content
         )
 
     @abc.abstractmethod
@@ -109,7 +390,7 @@ class BaseSession(abc.ABC):
         self,
         bot: VkBot,
         method: VkMethod[VkType],
-        timeout: Optional[int] = None,
+        timeout: Optional[TimeoutType] = None,
     ) -> VkType:  # pragma: no cover
         """
         Make request to Vk Bot API
@@ -136,6 +417,123 @@ class BaseSession(abc.ABC):
         """
         yield b""
 
+    @abc.abstractmethod
+    async def stream_response(
+        self,
+        bot: VkBot,
+        method: VkMethod[VkType],
+        timeout: Optional[TimeoutType] = None,
+        chunk_size: int = 65536,
+    ) -> AsyncGenerator[bytes, None]:  # pragma: no cover
+        """
+        Make request to Vk Bot API and stream raw response body
+
+        Unsuccessful responses are checked by :meth:`check_response` before streaming.
+
+        :param bot: Bot instance
+        :param method: Method instance
+        :param timeout: Request timeout
+        :param chunk_size: Size of chunks
+        :raise VkApiError:
+        """
+        yield b""
+
+    async def stream_raw_items(
+        self,
+        bot: VkBot,
+        method: VkMethod[Any],
+        timeout: Optional[TimeoutType] = None,
+        chunk_size: int = 65536,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Make request to Vk Bot API and yield decoded but not validated items
+        of the response one by one while the response is being received,
+        so the whole body is never decoded at once.
+
+        Request middlewares are not applied to streamed requests.
+
+        :param bot: Bot instance
+        :param method: Method instance
+        :param timeout: Request timeout
+        :param chunk_size: Size of chunks read from the response
+        :raise VkApiError:
+        """
+        parser = JsonItemsParser(method.__items_path__)
+        with self.track_call(bot, method):
+            stream = self.stream_response(bot, method, timeout=timeout, chunk_size=chunk_size)
+            try:
+                async for chunk in stream:
+                    try:
+                        items = parser.feed(chunk)
+                    except ValueError as e:
+                        raise ClientDecodeError("Failed to decode object", e, chunk)
+                    for item in items:
+                        yield item
+            finally:
+                await stream.aclose()
+
+        try:
+            envelope = parser.close()
+        except ValueError as e:
+            raise ClientDecodeError("Failed to decode object", e, None)
+        # Validate everything except of the items and raise API errors
+        self.check_response(bot=bot, method=method, status_code=HTTPStatus.OK, content=envelope)
+
+    async def stream_items(
+        self,
+        bot: VkBot,
+        method: VkMethod[Any],
+        timeout: Optional[TimeoutType] = None,
+        chunk_size: int = 65536,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Same as :meth:`stream_raw_items`, but items are validated
+        as :code:`__item_type__` of the method.
+
+        :param bot: Bot instance
+        :param method: Method instance
+        :param timeout: Request timeout
+        :param chunk_size: Size of chunks read from the response
+        :raise VkApiError:
+        """
+        item_type = method.__item_type__
+        if item_type is None:
+            raise TypeError(f"Method {type(method).__name__!r} doesn't support items streaming")
+
+        stream = self.stream_raw_items(bot, method, timeout=timeout, chunk_size=chunk_size)
+        try:
+            async for item in stream:
+                try:
+                    yield item_type.model_validate(item, context={"bot": bot})
+                except ValidationError as e:
+                    raise ClientDecodeError("Failed to deserialize object", e, item)
+        finally:
+            await stream.aclose()
+
+    @abc.abstractmethod
+    async def upload_file(
+        self,
+        bot: VkBot,
+        method: VkMethod[Any],
+        url: str,
+        files: Dict[str, InputFile],
+        timeout: Optional[TimeoutType] = None,
+    ) -> Any:  # pragma: no cover
+        """
+        Upload files to the Vk upload server (second step of the upload flow)
+
+        Files are streamed straight into the request body.
+
+        :param bot: Bot instance
+        :param method: Method the upload URL was received from, used for error reporting
+        :param url: Upload URL
+        :param files: Form field name to file mapping
+        :param timeout: Request timeout
+        :return: Decoded upload server response
+        :raise VkNetworkError:
+        """
+        pass
+
     def prepare_value(
         self,
         value: Any,
@@ -207,10 +605,131 @@ class BaseSession(abc.ABC):
         self,
         bot: VkBot,
         method: VkMethod[VkType],
-        timeout: Optional[int] = None,
+        timeout: Optional[TimeoutType] = None,
     ) -> VkType:
-        middleware = self.middleware.wrap_middlewares(self.make_request, timeout=timeout)
-        return cast(VkType, await middleware(bot, method))
+        with self.track_call(bot, method):
+            middleware = self.middleware.wrap_middlewares(self.make_request, timeout=timeout)
+            return cast(VkType, await middleware(bot, method))
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Number of API calls being made
+        """
+        return self._in_flight
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of the session metrics, sessions extend it with their own values
+
+        :return: :code:`calls` - API calls made, :code:`errors` - failed calls,
+            :code:`in_flight` - calls being made,
+            :code:`pending` - calls being made by token label
+            (see :func:`aiogram_vk.utils.token.token_label`),
+            :code:`loop` - event loop lag when the monitor is enabled
+        """
+        pending: Dict[str, int] = {}
+        for token, count in self._pending.items():
+            # Labels are short hashes, calls of the tokens with the same label are summed up
+            label = token_label(token)
+            pending[label] = pending.get(label, 0) + count
+        metrics: Dict[str, Any] = {
+            "calls": self._calls,
+            "errors": self._errors,
+            "in_flight": self._in_flight,
+            "pending": pending,
+        }
+        if self.loop_monitor is not None:
+            metrics["loop"] = self.loop_monitor.as_dict()
+        return metrics
+
+    async def stop_loop_monitor(self) -> None:
+        """
+        Stop the event loop lag monitor, called by :meth:`close`
+        """
+        if self.loop_monitor is not None:
+            await self.loop_monitor.stop()
+
+    @contextmanager
+    def track_call(self, bot: VkBot, method: VkMethod[Any]) -> Iterator[None]:
+        """
+        Count API call made in the block in the metrics of the session,
+        so :meth:`drain` waits for it.
+        Used by the sessions which send requests through another session,
+        like :class:`aiogram_vk.client.session.pool.PooledSession`
+
+        :param bot: Bot instance
+        :param method: Method instance
+        :raise VkNetworkError: when the session is shutting down
+        """
+        self._enter_call(bot, method)
+        try:
+            yield
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._exit_call(bot)
+
+    def _enter_call(self, bot: VkBot, method: VkMethod[Any]) -> None:
+        if self._draining:
+            raise VkNetworkError(method=method, message="Session is shutting down")
+        if self.loop_monitor is not None and not self.loop_monitor.running:
+            self.loop_monitor.start()
+        self._in_flight += 1
+        self._calls += 1
+        self._pending[bot.token] = self._pending.get(bot.token, 0) + 1
+
+    def _exit_call(self, bot: VkBot) -> None:
+        self._in_flight -= 1
+        pending = self._pending[bot.token] - 1
+        if pending:
+            self._pending[bot.token] = pending
+        else:
+            del self._pending[bot.token]
+        if not self._in_flight and self._drained is not None:
+            self._drained.set()
+
+    async def drain(self, timeout: Optional[float] = None) -> int:
+        """
+        Stop accepting new API calls and wait for the calls being made.
+        New calls fail with :class:`aiogram_vk.exceptions.VkNetworkError`
+        until the session is closed by :meth:`shutdown`.
+
+        :param timeout: Maximum time to wait in seconds, wait forever by default
+        :return: number of calls which are not finished in time
+        """
+        self._draining = True
+        if self._in_flight:
+            self._drained = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._drained.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._drained = None
+        return self._in_flight
+
+    async def shutdown(self, timeout: Optional[float] = None) -> int:
+        """
+        Close session gracefully: wait for the calls being made with :meth:`drain`
+        and close the connections, calls which are not finished in time are aborted
+
+        .. code-block:: python
+
+            cancelled = await bot.session.shutdown(timeout=10)
+            if cancelled:
+                logging.warning("%d API calls were cancelled on shutdown", cancelled)
+
+        :param timeout: Maximum time to wait for the calls in seconds, wait forever by default
+        :return: number of aborted calls
+        """
+        try:
+            cancelled = await self.drain(timeout=timeout)
+            await self.close()
+        finally:
+            self._draining = False
+        return cancelled
 
     async def __aenter__(self) -> BaseSession:
         return self
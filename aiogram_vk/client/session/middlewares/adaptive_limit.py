@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Any, Deque, FrozenSet, Iterable, List, Optional, Tuple
+
+from aiogram_vk import loggers
+from aiogram_vk.exceptions import VkAPIError, VkNetworkError
+from aiogram_vk.methods import VkMethod
+from aiogram_vk.methods.base import Response, VkType
+from aiogram_vk.utils.timeouts import wait_within_deadline
+
+from .base import BaseRequestMiddleware, NextRequestMiddlewareType
+
+if TYPE_CHECKING:
+    from ...bot import VkBot
+
+OVERLOAD_ERROR_CODES: FrozenSet[int] = frozenset({6, 9, 10})
+"Too many requests per second, flood control and internal server error"
+
+
+class ConcurrencyLimit:
+    """
+    Concurrency limit of one scope, changed with AIMD:
+    increased by one per limit of successful calls
+    and multiplied by the decrease factor on overload
+    """
+
+    def __init__(self, limit: float, min_limit: int, max_limit: int) -> None:
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.min_latency: Optional[float] = None
+        self.latency: Optional[float] = None
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._decreased_at = 0.0
+
+    async def acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await wait_within_deadline(waiter)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted but not used
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wakeup()
+
+    def _wakeup(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    @property
+    def idle(self) -> bool:
+        return not self.in_flight and not self._waiters
+
+    def on_success(self, latency: float, tolerance: float, smoothing: float) -> bool:
+        """
+        :return: whether latency shows the overload
+        """
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += (latency - self.latency) * smoothing
+        if self.min_latency is None or latency < self.min_latency:
+            self.min_latency = latency
+        else:
+            # Forget the old minimum slowly, so the baseline follows
+            # the changes of the server capacity
+            self.min_latency += (latency - self.min_latency) * smoothing / 10
+
+        if self.latency > self.min_latency * tolerance:
+            return True
+        if self.in_flight >= int(self.limit):
+            # Increase only when the limit is actually reached
+            self.limit = min(self.limit + 1 / self.limit, self.max_limit)
+            self._wakeup()
+        return False
+
+    def on_overload(self, now: float, factor: float) -> bool:
+        """
+        :return: whether the limit was decreased
+        """
+        # Calls sent with the old limit finish within the current latency,
+        # their overload signals belong to the same congestion event
+        if now - self._decreased_at < (self.latency or 0.0):
+            return False
+        self._decreased_at = now
+        self.limit = max(self.limit * factor, self.min_limit)
+        return True
+
+
+class AdaptiveConcurrencyLimiter(BaseRequestMiddleware):
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease_factor: float = 0.7,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        per_method: bool = True,
+        overload_error_codes: Iterable[int] = OVERLOAD_ERROR_CODES,
+        max_scopes: int = 1024,
+    ) -> None:
+        """
+        Middleware which limits the number of concurrent requests per token
+        (and per method) and adapts the limit to the observed server capacity
+        with additive increase and multiplicative decrease:
+
+        - limit grows by one per limit of successful calls while it is reached;
+        - limit is multiplied by :code:`decrease_factor` when the call fails
+          with an overload error (too many requests, flood control, internal error),
+          a network error or when the smoothed latency exceeds
+          :code:`latency_tolerance` times the minimal observed latency.
+
+        :param initial_limit: Initial number of concurrent requests
+        :param min_limit: Minimal number of concurrent requests
+        :param max_limit: Maximal number of concurrent requests
+        :param decrease_factor: Factor of the limit decrease on overload
+        :param latency_tolerance: Allowed ratio of the current latency to the minimal one
+        :param smoothing: Weight of the new latency sample in the moving average
+        :param per_method: Limit methods of the token separately
+        :param overload_error_codes: Vk error codes treated as overload
+        :param max_scopes: Number of scopes (tokens or token and method pairs)
+            to keep the limits of, learned limits of the least recently used idle scopes
+            are forgotten
+        """
+        if not 0 < decrease_factor < 1:
+            raise ValueError("Decrease factor should be between 0 and 1")
+        self.initial_limit = initial_limit
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.per_method = per_method
+        self.overload_error_codes = frozenset(overload_error_codes)
+        self.max_scopes = max_scopes
+        self._limits: OrderedDict[Tuple[str, Optional[str]], ConcurrencyLimit] = OrderedDict()
+
+    def get_limit(self, bot: VkBot, method: VkMethod[Any]) -> ConcurrencyLimit:
+        """
+        Get limit of the scope the request belongs to
+
+        :param bot: bot
+        :param method: method
+        :return: limit
+        """
+        key = (bot.token, method.__api_method__ if self.per_method else None)
+        limit = self._limits.get(key)
+        if limit is not None:
+            self._limits.move_to_end(key)
+            return limit
+        limit = self._limits[key] = ConcurrencyLimit(
+            limit=min(max(self.initial_limit, self.min_limit), self.max_limit),
+            min_limit=self.min_limit,
+            max_limit=self.max_limit,
+        )
+        excess = len(self._limits) - self.max_scopes
+        if excess > 0:
+            # Scopes with requests in flight are kept over the limit
+            stale: List[Tuple[str, Optional[str]]] = []
+            for scope, candidate in self._limits.items():
+                if len(stale) >= excess or candidate is limit:
+                    break
+                if candidate.idle:
+                    stale.append(scope)
+            for scope in stale:
+                del self._limits[scope]
+        return limit
+
+    def is_overload(self, error: Exception) -> bool:
+        if isinstance(error, VkNetworkError):
+            return True
+        if isinstance(error, VkAPIError):
+            return error.error_code in self.overload_error_codes
+        return False
+
+    def _decrease(self, limit: ConcurrencyLimit, method: VkMethod[Any], reason: str) -> None:
+        loop = asyncio.get_running_loop()
+        if limit.on_overload(loop.time(), self.decrease_factor):
+            loggers.middlewares.info(
+                "Concurrency limit of %s is decreased to %d: %s",
+                method.__api_method__,
+                int(limit.limit),
+                reason,
+            )
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[VkType],
+        bot: "VkBot",
+        method: VkMethod[VkType],
+    ) -> Response[VkType]:
+        limit = self.get_limit(bot, method)
+        try:
+            await limit.acquire()
+        except asyncio.TimeoutError:
+            raise VkNetworkError(
+                method=method, message="Request deadline exceeded while waiting for the limit"
+            )
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            result = await make_request(bot, method)
+        except Exception as e:
+            if self.is_overload(e):
+                self._decrease(limit, method, f"{type(e).__name__}: {e}")
+            raise
+        else:
+            if limit.on_success(loop.time() - started, self.latency_tolerance, self.smoothing):
+                self._decrease(limit, method, "latency growth")
+            return result
+        finally:
+            limit.release()
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+from urllib.parse import urlsplit
+
+from pydantic import ValidationError
+
+from aiogram_vk import loggers
+from aiogram_vk.exceptions import (
+    ClientDecodeError,
+    VkAPIError,
+    VkCircuitOpen,
+    VkNetworkError,
+)
+from aiogram_vk.methods import VkMethod
+from aiogram_vk.methods.base import Response, VkType
+
+from .base import BaseRequestMiddleware, NextRequestMiddlewareType
+
+if TYPE_CHECKING:
+    from ...bot import VkBot
+
+FAILURE_ERROR_CODES: FrozenSet[int] = frozenset({10})
+"Internal server error"
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    "Requests are sent"
+    OPEN = "open"
+    "Requests fail without sending"
+    HALF_OPEN = "half_open"
+    "Limited number of probe requests is sent"
+
+
+class Circuit:
+    """
+    State of the circuit of one scope
+    """
+
+    def __init__(self, recovery_timeout: float) -> None:
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.recovery_timeout = recovery_timeout
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+
+    @property
+    def idle(self) -> bool:
+        """
+        Circuit is closed without failures, so it is the same as the new one
+        """
+        return self.state is CircuitState.CLOSED and not self.failures
+
+    def retry_after(self, now: float) -> float:
+        return max(self.opened_at + self.recovery_timeout - now, 0.0)
+
+    def allow(self, now: float, probes: int) -> bool:
+        """
+        :return: whether the request can be sent
+        """
+        if self.state is CircuitState.OPEN:
+            if self.retry_after(now) > 0:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self.probes = 0
+            self.probe_successes = 0
+        if self.state is CircuitState.HALF_OPEN:
+            if self.probes >= probes:
+                return False
+            self.probes += 1
+        return True
+
+    def on_success(self, probes: int, initial_recovery_timeout: float) -> bool:
+        """
+        :return: whether the circuit is closed by this call
+        """
+        self.failures = 0
+        if self.state is not CircuitState.HALF_OPEN:
+            return False
+        self.probe_successes += 1
+        if self.probe_successes < probes:
+            return False
+        self.state = CircuitState.CLOSED
+        self.recovery_timeout = initial_recovery_timeout
+        return True
+
+    def on_failure(self, now: float, threshold: int, max_recovery_timeout: float) -> bool:
+        """
+        :return: whether the circuit is opened by this call
+        """
+        if self.state is CircuitState.HALF_OPEN:
+            # Backend is still broken, wait longer before the next probes
+            self.recovery_timeout = min(self.recovery_timeout * 2, max_recovery_timeout)
+        elif self.state is CircuitState.CLOSED:
+            self.failures += 1
+            if self.failures < threshold:
+                return False
+        else:
+            # Request sent before the circuit was opened
+            return False
+        self.state = CircuitState.OPEN
+        self.opened_at = now
+        self.failures = 0
+        return True
+
+    def on_cancel(self) -> None:
+        if self.state is CircuitState.HALF_OPEN and self.probes > 0:
+            # Give the probe slot to another request
+            self.probes -= 1
+
+
+class CircuitBreaker(BaseRequestMiddleware):
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 10.0,
+        max_recovery_timeout: float = 300.0,
+        half_open_probes: int = 1,
+        scope: str = "method",
+        failure_error_codes: Iterable[int] = FAILURE_ERROR_CODES,
+        cached_methods: Optional[Iterable[Type[VkMethod[Any]]]] = None,
+        cache_size: int = 1024,
+        cache_ttl: Optional[float] = None,
+        max_circuits: int = 1024,
+    ) -> None:
+        """
+        Middleware which stops sending requests to the broken backend.
+
+        After :code:`failure_threshold` consecutive failures
+        (network errors and timeouts, undecodable responses of 5xx pages
+        and Vk internal server errors) of the scope the circuit is opened
+        and requests fail immediately with :class:`aiogram_vk.exceptions.VkCircuitOpen`
+        instead of waiting for the request timeout.
+        After :code:`recovery_timeout` the circuit is half-open:
+        :code:`half_open_probes` requests are sent, the circuit is closed when all of them
+        succeed and opened again with twice longer recovery timeout otherwise.
+
+        Results of :code:`cached_methods` are remembered and returned
+        instead of the error while the circuit is open.
+
+        .. code-block:: python
+
+            bot.session.middleware(
+                CircuitBreaker(cached_methods=[audio.GetCount], cache_ttl=600)
+            )
+
+        :param failure_threshold: Number of consecutive failures opening the circuit
+        :param recovery_timeout: Time before the first probe request, in seconds
+        :param max_recovery_timeout: Maximal time between probes, in seconds
+        :param half_open_probes: Number of successful probes closing the circuit
+        :param scope: :code:`"method"` to track every API method separately
+            or :code:`"host"` to track the API host as a whole
+        :param failure_error_codes: Vk error codes treated as failures
+        :param cached_methods: Methods which results can be served while the circuit is open,
+            only read-only methods should be listed here
+        :param cache_size: Maximal number of cached results
+        :param cache_ttl: Maximal age of the served result in seconds, unlimited by default
+        :param max_circuits: Number of circuits to keep,
+            least recently used circuits are forgotten when they are closed without failures
+        """
+        if scope not in ("method", "host"):
+            raise ValueError("Scope should be 'method' or 'host'")
+        self.failure_threshold = max(failure_threshold, 1)
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max(max_recovery_timeout, recovery_timeout)
+        self.half_open_probes = max(half_open_probes, 1)
+        self.scope = scope
+        self.failure_error_codes = frozenset(failure_error_codes)
+        self.cached_methods = frozenset(cached_methods or ())
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.max_circuits = max_circuits
+        self._circuits: OrderedDict[str, Circuit] = OrderedDict()
+        self._cache: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+
+    def get_scope(self, bot: VkBot, method: VkMethod[Any]) -> str:
+        """
+        Get key of the circuit the request belongs to
+
+        :param bot: bot
+        :param method: method
+        :return: key
+        """
+        host = urlsplit(bot.session.api.base).netloc
+        if self.scope == "host":
+            return host
+        return f"{host}/{method.__api_method__}"
+
+    def get_circuit(self, bot: VkBot, method: VkMethod[Any]) -> Circuit:
+        key = self.get_scope(bot, method)
+        circuit = self._circuits.get(key)
+        if circuit is not None:
+            self._circuits.move_to_end(key)
+            return circuit
+        circuit = self._circuits[key] = Circuit(self.recovery_timeout)
+        excess = len(self._circuits) - self.max_circuits
+        if excess > 0:
+            # Open and failing circuits are kept over the limit
+            stale: List[str] = []
+            for scope, candidate in self._circuits.items():
+                if len(stale) >= excess or candidate is circuit:
+                    break
+                if candidate.idle:
+                    stale.append(scope)
+            for scope in stale:
+                del self._circuits[scope]
+        return circuit
+
+    def state(self, bot: VkBot, method: VkMethod[Any]) -> CircuitState:
+        """
+        State of the circuit the request belongs to
+
+        :param bot: bot
+        :param method: method
+        """
+        return self.get_circuit(bot, method).state
+
+    def is_failure(self, error: Exception) -> bool:
+        if isinstance(error, VkCircuitOpen):
+            # Raised by another circuit breaker
+            return False
+        if isinstance(error, VkNetworkError):
+            return True
+        if isinstance(error, VkAPIError):
+            return error.error_code in self.failure_error_codes
+        if isinstance(error, ClientDecodeError):
+            # Html error pages of the proxy, but not the schema mismatch
+            return not isinstance(error.original, ValidationError)
+        return False
+
+    def _cache_key(self, bot: VkBot, method: VkMethod[Any]) -> Optional[Hashable]:
+        if type(method) not in self.cached_methods:
+            return None
+        try:
+            return bot.token, type(method), method.model_dump_json(warnings=False)
+        except (TypeError, ValueError):
+            return None
+
+    def _cache_get(self, key: Optional[Hashable], now: float) -> Tuple[bool, Any]:
+        if key is None or key not in self._cache:
+            return False, None
+        stored_at, result = self._cache[key]
+        if self.cache_ttl is not None and now - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return False, None
+        return True, result
+
+    def _cache_set(self, key: Optional[Hashable], now: float, result: Any) -> None:
+        if key is None or self.cache_size <= 0:
+            return
+        self._cache[key] = (now, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[VkType],
+        bot: "VkBot",
+        method: VkMethod[VkType],
+    ) -> Response[VkType]:
+        circuit = self.get_circuit(bot, method)
+        cache_key = self._cache_key(bot, method)
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+
+        if not circuit.allow(now, self.half_open_probes):
+            found, cached = self._cache_get(cache_key, now)
+            if found:
+                return cached  # type: ignore[no-any-return]
+            raise VkCircuitOpen(
+                method=method,
+                message=f"Circuit of {self.get_scope(bot, method)} is {circuit.state.value}",
+                retry_after=circuit.retry_after(now),
+            )
+
+        try:
+            result = await make_request(bot, method)
+        except Exception as e:
+            if not self.is_failure(e):
+                circuit.on_success(self.half_open_probes, self.recovery_timeout)
+            elif circuit.on_failure(
+                loop.time(), self.failure_threshold, self.max_recovery_timeout
+            ):
+                loggers.middlewares.warning(
+                    "Circuit of %s is opened for %.1f seconds: %s: %s",
+                    self.get_scope(bot, method),
+                    circuit.recovery_timeout,
+                    type(e).__name__,
+                    e,
+                )
+            raise
+        except BaseException:
+            circuit.on_cancel()
+            raise
+
+        if circuit.on_success(self.half_open_probes, self.recovery_timeout):
+            loggers.middlewares.info("Circuit of %s is closed", self.get_scope(bot, method))
+        self._cache_set(cache_key, loop.time(), result)
+        return result
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from aiogram_vk.exceptions import VkNetworkError
+from aiogram_vk.methods import VkMethod
+from aiogram_vk.methods.base import Response, VkType
+from aiogram_vk.utils.timeouts import wait_within_deadline
+
+from .base import BaseRequestMiddleware, NextRequestMiddlewareType
+
+if TYPE_CHECKING:
+    from ...bot import VkBot
+
+
+class RequestPriority(IntEnum):
+    """
+    Priority class of the request, lower value is served first
+    """
+
+    INTERACTIVE = 0
+    "User-facing calls, for example answers to the incoming messages"
+    NORMAL = 1
+    "Default priority"
+    BACKGROUND = 2
+    "Crawls, pagination and other bulk calls"
+
+
+current_priority: ContextVar[Optional[int]] = ContextVar("current_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """
+    Set priority of the requests made in the block
+
+    .. code-block:: python
+
+        with request_priority(RequestPriority.BACKGROUND):
+            tracks = await bot(audio.Get(owner_id=owner_id, offset=offset))
+
+    :param priority: priority, see :class:`RequestPriority`
+    """
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class _TokenScheduler:
+    """
+    Token bucket with the priority queue of waiters
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = asyncio.get_running_loop().time()
+        self.waiters: List[Tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _refill(self) -> None:
+        now = asyncio.get_running_loop().time()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _schedule(self) -> None:
+        if self._timer is not None or not self.waiters:
+            return
+        delay = max(1.0 - self.tokens, 0.0) / self.rate
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        self._timer = None
+        self._refill()
+        while self.waiters and self.tokens >= 1:
+            *_, waiter = heapq.heappop(self.waiters)
+            if waiter.done():
+                # Cancelled while waiting
+                continue
+            self.tokens -= 1
+            waiter.set_result(None)
+        self._schedule()
+
+    async def acquire(self, priority: int) -> None:
+        self._refill()
+        if not self.waiters and self.tokens >= 1:
+            self.tokens -= 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self._counter), waiter))
+        self._schedule()
+        try:
+            await wait_within_deadline(waiter)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted but not used, give it to the next waiter
+                self.tokens += 1
+                self._release()
+            raise
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for *_, waiter in self.waiters if not waiter.done())
+
+    @property
+    def idle(self) -> bool:
+        """
+        Bucket is full and nobody waits, so it is the same as the new one
+        """
+        if self.waiters or self._timer is not None:
+            return False
+        self._refill()
+        return self.tokens >= self.burst
+
+
+class PriorityScheduler(BaseRequestMiddleware):
+    def __init__(
+        self,
+        rate: float = 3.0,
+        burst: int = 3,
+        default_priority: int = RequestPriority.NORMAL,
+        method_priorities: Optional[Dict[Type[VkMethod[Any]], int]] = None,
+        max_tokens: int = 1024,
+    ) -> None:
+        """
+        Middleware which spends the per-token rate budget by priority:
+        when the budget is exhausted, waiting requests are sent
+        in the order of their priority and then in the order of arrival,
+        so interactive calls are not stuck behind background crawls.
+
+        Priority is taken from :func:`request_priority` block,
+        then from :code:`method_priorities` and :code:`default_priority` otherwise.
+
+        .. code-block:: python
+
+            bot.session.middleware(
+                PriorityScheduler(
+                    rate=3,
+                    method_priorities={audio.Get: RequestPriority.BACKGROUND},
+                )
+            )
+
+        :param rate: Requests per second allowed for one token
+            (Vk allows 3 for user tokens and 20 for community tokens)
+        :param burst: Maximum number of requests sent at once after idle time
+        :param default_priority: Priority of requests without explicit one
+        :param method_priorities: Default priorities of the methods
+        :param max_tokens: Number of tokens to keep the budgets of,
+            least recently used tokens are forgotten when their budget is full
+        """
+        if rate <= 0:
+            raise ValueError("Rate should be positive")
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.default_priority = default_priority
+        self.method_priorities = method_priorities or {}
+        self.max_tokens = max_tokens
+        self._schedulers: OrderedDict[str, _TokenScheduler] = OrderedDict()
+
+    def get_priority(self, method: VkMethod[Any]) -> int:
+        """
+        Resolve priority of the request
+
+        :param method: method
+        :return: priority
+        """
+        priority = current_priority.get()
+        if priority is not None:
+            return priority
+        return self.method_priorities.get(type(method), self.default_priority)
+
+    def pending(self, bot: VkBot) -> int:
+        """
+        Number of requests of the bot waiting for the budget
+
+        :param bot: bot
+        """
+        scheduler = self._schedulers.get(bot.token)
+        return 0 if scheduler is None else scheduler.pending
+
+    def _get_scheduler(self, token: str) -> _TokenScheduler:
+        scheduler = self._schedulers.get(token)
+        if scheduler is not None:
+            self._schedulers.move_to_end(token)
+            return scheduler
+        scheduler = self._schedulers[token] = _TokenScheduler(self.rate, self.burst)
+        excess = len(self._schedulers) - self.max_tokens
+        if excess > 0:
+            # Full buckets are dropped without losing anything,
+            # buckets which are still in use are kept over the limit
+            stale: List[str] = []
+            for key, candidate in self._schedulers.items():
+                if len(stale) >= excess or candidate is scheduler:
+                    break
+                if candidate.idle:
+                    stale.append(key)
+            for key in stale:
+                del self._schedulers[key]
+        return scheduler
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[VkType],
+        bot: "VkBot",
+        method: VkMethod[VkType],
+    ) -> Response[VkType]:
+        scheduler = self._get_scheduler(bot.token)
+        try:
+            await scheduler.acquire(self.get_priority(method))
+        except asyncio.TimeoutError:
+            raise VkNetworkError(
+                method=method, message="Request deadline exceeded while waiting for the budget"
+            )
+        return await make_request(bot, method)
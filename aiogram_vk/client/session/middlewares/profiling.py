@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import json
+import pstats
+import random
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, NamedTuple, Optional, Union
+
+from aiogram_vk import loggers
+from aiogram_vk.methods import VkMethod
+from aiogram_vk.methods.base import Response, VkType
+from aiogram_vk.utils.stage_timer import stage_timer
+
+from .base import BaseRequestMiddleware, NextRequestMiddlewareType
+
+if TYPE_CHECKING:
+    from ...bot import VkBot
+
+CPROFILE = "cprofile"
+YAPPI = "yappi"
+
+# Only one profiler can be active in the process, shared by all middlewares
+_capturing = False
+
+
+def _import_yappi() -> Any:
+    try:
+        import yappi  # type: ignore
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError(
+            "In order to profile calls with yappi, install https://pypi.org/project/yappi/"
+        ) from exc
+    return yappi
+
+
+def _task_tag() -> int:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        return 0
+    return 0 if task is None else id(task)
+
+
+class CallProfile(NamedTuple):
+    """
+    Profile of one call
+    """
+
+    method: str
+    "API method"
+    started: float
+    "Unix time of the call start"
+    duration: float
+    "Duration in seconds"
+    stages: Dict[str, float]
+    "Time of the stages in seconds, see :func:`aiogram_vk.utils.stage_timer.mark_stage`"
+    reason: str
+    ":code:`sampled` or :code:`slow`"
+    error: Optional[str] = None
+    "Exception raised by the call"
+    profile: Optional[str] = None
+    "Text report of the profiler"
+
+
+class ProfilingMiddleware(BaseRequestMiddleware):
+    def __init__(
+        self,
+        sample_rate: float = 0.01,
+        slow_threshold: Optional[float] = 1.0,
+        buffer_size: int = 256,
+        profiler: Optional[str] = None,
+        profile_limit: int = 30,
+    ) -> None:
+        """
+        Middleware which collects profiles of the sampled and slow calls
+        into the ring buffer, so hot spots can be found in production
+        without profiling of the whole process.
+
+        Every call is split into stages (time in the middlewares, preparation of the request,
+        network, decoding and validation), profiles of the sampled calls
+        and of the calls slower than :code:`slow_threshold` are kept.
+        Sampled calls can be captured with the profiler:
+
+        - :code:`"cprofile"` - :mod:`cProfile` of the event loop thread while the call runs,
+          it includes work of other tasks done meanwhile;
+        - :code:`"yappi"` - `yappi <https://pypi.org/project/yappi/>`_ statistics
+          of the task making the call only.
+
+        One call is captured at a time in the whole process, other calls sampled meanwhile
+        get stages only. Errors of the profiler (for example when another profiler
+        is already active) are logged and the call gets stages only.
+
+        .. code-block:: python
+
+            profiling = ProfilingMiddleware(sample_rate=0.001, profiler="yappi")
+            bot.session.middleware(profiling)
+            ...
+            profiling.dump("profiles.json")
+
+        :param sample_rate: Fraction of the calls to profile
+        :param slow_threshold: Calls slower than this time in seconds are always kept,
+            disabled when None
+        :param buffer_size: Number of the last profiles to keep
+        :param profiler: :code:`"cprofile"`, :code:`"yappi"` or None to collect stages only
+        :param profile_limit: Number of functions in the profiler report
+        """
+        if profiler not in (None, CPROFILE, YAPPI):
+            raise ValueError(f"Unknown profiler {profiler!r}")
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.profiler = profiler
+        self.profile_limit = profile_limit
+        self.profiles: Deque[CallProfile] = deque(maxlen=buffer_size)
+        self._yappi = _import_yappi() if profiler == YAPPI else None
+
+    def _start_capture(self) -> Any:
+        global _capturing
+
+        if _capturing:
+            return None
+        try:
+            if self._yappi is not None:
+                self._yappi.set_tag_callback(_task_tag)
+                self._yappi.start()
+                capture: Any = _task_tag()
+            else:
+                capture = cProfile.Profile()
+                capture.enable()
+        except Exception as e:
+            loggers.middlewares.warning("Failed to start profiler: %s: %s", type(e).__name__, e)
+            return None
+        _capturing = True
+        return capture
+
+    def _stop_capture(self, capture: Any) -> Optional[str]:
+        global _capturing
+
+        try:
+            return self._report(capture)
+        except Exception as e:
+            loggers.middlewares.warning("Failed to stop profiler: %s: %s", type(e).__name__, e)
+            return None
+        finally:
+            _capturing = False
+
+    def _report(self, capture: Any) -> str:
+        if self._yappi is not None:
+            self._yappi.stop()
+            stats = self._yappi.get_func_stats(filter={"tag": capture})
+            stats.sort("ttot")
+            lines = [
+                f"{stat.ncall:>8} {stat.tsub:10.6f} {stat.ttot:10.6f}  {stat.full_name}"
+                for stat in list(stats)[: self.profile_limit]
+            ]
+            self._yappi.clear_stats()
+            return "\n".join(["   ncall      tsub       ttot  function", *lines])
+        capture.disable()
+        stream = io.StringIO()
+        pstats.Stats(capture, stream=stream).sort_stats("cumulative").print_stats(
+            self.profile_limit
+        )
+        return stream.getvalue()
+
+    def dump(self, path: Optional[Union[str, Path]] = None) -> List[Dict[str, Any]]:
+        """
+        Get collected profiles
+
+        :param path: Also write profiles to this JSON file
+        :return: profiles, oldest first
+        """
+        profiles = [profile._asdict() for profile in self.profiles]
+        if path is not None:
+            Path(path).write_text(json.dumps(profiles, indent=2))
+        return profiles
+
+    def clear(self) -> None:
+        self.profiles.clear()
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[VkType],
+        bot: "VkBot",
+        method: VkMethod[VkType],
+    ) -> Response[VkType]:
+        sampled = random.random() < self.sample_rate
+        capture = None
+        if sampled and self.profiler is not None:
+            capture = self._start_capture()
+
+        started = time.time()
+        error = None
+        with stage_timer() as timer:
+            try:
+                return await make_request(bot, method)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                # Response handling in the inner middlewares
+                timer.mark("post")
+                duration = timer.elapsed
+                report = None if capture is None else self._stop_capture(capture)
+                slow = self.slow_threshold is not None and duration >= self.slow_threshold
+                if sampled or slow:
+                    self.profiles.append(
+                        CallProfile(
+                            method=method.__api_method__,
+                            started=started,
+                            duration=duration,
+                            stages=timer.stages,
+                            reason="sampled" if sampled else "slow",
+                            error=error,
+                            profile=report,
+                        )
+                    )
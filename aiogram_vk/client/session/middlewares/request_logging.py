@@ -1,9 +1,14 @@
 import logging
-from typing import TYPE_CHECKING, Any, List, Optional, Type
+import random
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Type
 
 from aiogram_vk import loggers
+from aiogram_vk.exceptions import VkAPIError
 from aiogram_vk.methods import VkMethod
 from aiogram_vk.methods.base import Response, VkType
+from aiogram_vk.utils.token import token_label
 
 from .base import BaseRequestMiddleware, NextRequestMiddlewareType
 
@@ -28,10 +33,203 @@ class RequestLogging(BaseRequestMiddleware):
         bot: "VkBot",
         method: VkMethod[VkType],
     ) -> Response[VkType]:
-        if type(method) not in self.ignore_methods:
+        if loggers.middlewares.isEnabledFor(logging.INFO) and (
+            type(method) not in self.ignore_methods
+        ):
             loggers.middlewares.info(
-                "Make request with method=%r by bot id=%d",
+                "Make request with method=%r by bot token=%s",
                 type(method).__name__,
-                bot.id,
+                token_label(bot.token),
             )
         return await make_request(bot, method)
+
+
+class LazyField:
+    """
+    Value of the log record computed only when the record is formatted.
+
+    Getter and its arguments are released once the value is computed.
+    Records with lazy fields can be serialized to JSON
+    with :code:`json.dumps(record.__dict__, default=LazyField.json_default)`.
+    """
+
+    __slots__ = ("_getter", "_args", "_value")
+
+    _missing: Any = object()
+
+    def __init__(self, getter: Callable[..., Any], *args: Any) -> None:
+        """
+        :param getter: Function computing the value, errors of the value
+            (:code:`TypeError` and :code:`ValueError`) are logged as :code:`None`
+        :param args: Arguments of the getter
+        """
+        self._getter: Optional[Callable[..., Any]] = getter
+        self._args = args
+        self._value = self._missing
+
+    @property
+    def value(self) -> Any:
+        if self._getter is not None:
+            try:
+                self._value = self._getter(*self._args)
+            except (TypeError, ValueError):
+                self._value = None
+            self._getter, self._args = None, ()
+        return self._value
+
+    @staticmethod
+    def json_default(obj: Any) -> Any:
+        """
+        :code:`default` hook of :func:`json.dumps` resolving lazy fields,
+        other objects which are not serializable by default are converted to strings
+
+        :param obj: Object which is not serializable by default
+        :return: value of the lazy field or string
+        """
+        if isinstance(obj, LazyField):
+            return obj.value
+        return str(obj)
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+
+def _payload_size(method_ref: "weakref.ref[VkMethod[Any]]") -> Optional[int]:
+    method = method_ref()
+    if method is None:
+        return None
+    return len(method.model_dump_json(warnings=False, exclude_none=True))
+
+
+class StructuredRequestLogging(BaseRequestMiddleware):
+    def __init__(
+        self,
+        level: int = logging.INFO,
+        error_level: int = logging.WARNING,
+        sample_rate: float = 1.0,
+        errors_per_interval: Optional[int] = 10,
+        error_interval: float = 60.0,
+        ignore_methods: Optional[List[Type[VkMethod[Any]]]] = None,
+        log: logging.Logger = loggers.middlewares,
+    ) -> None:
+        """
+        Middleware for logging of the finished requests with structured fields.
+
+        Fields are passed as attributes of the log record (:code:`extra`),
+        so they can be rendered by a structured (for example JSON) formatter:
+
+        - :code:`vk_method` - API method;
+        - :code:`vk_token` - token label, see :func:`aiogram_vk.utils.token.token_label`;
+        - :code:`vk_duration` - duration of the call in seconds;
+        - :code:`vk_payload_size` - size of the request parameters in JSON,
+          computed only when the record is formatted (:class:`LazyField`),
+          None when the method is already released by then;
+        - :code:`vk_error_code` - Vk error code of the failed call;
+        - :code:`vk_error` - exception type of the failed call;
+        - :code:`vk_suppressed` - number of the error records dropped by the rate limit
+          since the previous error record.
+
+        No work is done when both levels are disabled for the logger.
+        Use :meth:`LazyField.json_default` to serialize the records to JSON.
+        Successful calls are sampled, errors are rate-limited instead,
+        so the error storm doesn't flood the logs.
+
+        :param level: Level of the successful calls
+        :param error_level: Level of the failed calls
+        :param sample_rate: Fraction of the successful calls to log
+        :param errors_per_interval: Maximum number of the error records per interval,
+            unlimited when None
+        :param error_interval: Interval of the error rate limit in seconds
+        :param ignore_methods: methods to ignore in logging middleware
+        :param log: Logger
+        """
+        self.level = level
+        self.error_level = error_level
+        self.sample_rate = sample_rate
+        self.errors_per_interval = errors_per_interval
+        self.error_interval = error_interval
+        self.ignore_methods = frozenset(ignore_methods or ())
+        self.log = log
+        self._window_started = 0.0
+        self._window_errors = 0
+        self._suppressed = 0
+
+    def _allow_error(self, now: float) -> bool:
+        if self.errors_per_interval is None:
+            return True
+        if now - self._window_started >= self.error_interval:
+            self._window_started = now
+            self._window_errors = 0
+        if self._window_errors >= self.errors_per_interval:
+            self._suppressed += 1
+            return False
+        self._window_errors += 1
+        return True
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[VkType],
+        bot: "VkBot",
+        method: VkMethod[VkType],
+    ) -> Response[VkType]:
+        log_success = self.log.isEnabledFor(self.level) and (
+            self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        )
+        log_error = self.log.isEnabledFor(self.error_level)
+        if not (log_success or log_error) or type(method) in self.ignore_methods:
+            return await make_request(bot, method)
+
+        started = time.monotonic()
+        try:
+            response = await make_request(bot, method)
+        except Exception as e:
+            finished = time.monotonic()
+            if log_error and self._allow_error(finished):
+                suppressed, self._suppressed = self._suppressed, 0
+                error_code = e.error_code if isinstance(e, VkAPIError) else None
+                self.log.log(
+                    self.error_level,
+                    "Request %s failed in %.3fs: %s (error_code=%s)",
+                    method.__api_method__,
+                    finished - started,
+                    type(e).__name__,
+                    error_code,
+                    extra=self._fields(
+                        bot,
+                        method,
+                        finished - started,
+                        vk_error_code=error_code,
+                        vk_error=type(e).__name__,
+                        vk_suppressed=suppressed,
+                    ),
+                )
+            raise
+
+        if log_success:
+            duration = time.monotonic() - started
+            self.log.log(
+                self.level,
+                "Request %s done in %.3fs",
+                method.__api_method__,
+                duration,
+                extra=self._fields(bot, method, duration),
+            )
+        return response
+
+    @staticmethod
+    def _fields(
+        bot: "VkBot", method: VkMethod[Any], duration: float, **fields: Any
+    ) -> Dict[str, Any]:
+        return {
+            "vk_method": method.__api_method__,
+            "vk_token": LazyField(token_label, bot.token),
+            "vk_duration": duration,
+            "vk_payload_size": LazyField(_payload_size, weakref.ref(method)),
+            "vk_error_code": None,
+            "vk_error": None,
+            "vk_suppressed": 0,
+            **fields,
+        }
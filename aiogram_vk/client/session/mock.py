@@ -0,0 +1,314 @@
+"""
+In-memory session for tests and benchmarks.
+
+Calls pass the whole client pipeline: middlewares, preparation of the parameters,
+encoding of the response to JSON, its decoding and validation,
+only the network is replaced with the registered handlers.
+
+Overhead of the library per call can be printed with:
+
+.. code-block:: bash
+
+    python -m aiogram_vk.client.session.mock
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from collections import deque
+from http import HTTPStatus
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from ...methods import VkMethod
+from ...methods.base import VkType
+from ...types import InputFile
+from ...utils.stage_timer import mark_stage
+from ...utils.timeouts import TimeoutType
+from .base import BaseSession
+
+if TYPE_CHECKING:
+    from ..bot import VkBot
+
+MockHandler = Callable[[VkMethod[Any], Dict[str, Any]], Any]
+MockHandlerT = TypeVar("MockHandlerT", bound=MockHandler)
+MethodKey = Union[Type[VkMethod[Any]], str]
+
+
+class MockResponse(NamedTuple):
+    """
+    Response of the handler with full control over the payload
+    """
+
+    result: Any = None
+    "Result of the method"
+    error_code: Optional[int] = None
+    "Vk error code, the call fails when it is set"
+    error_msg: str = ""
+    "Vk error message"
+    status_code: int = 200
+    "HTTP status"
+    delay: float = 0.0
+    "Simulated response time in seconds"
+
+
+class MockSession(BaseSession):
+    """
+    Session answering API calls with the registered handlers, no sockets are opened.
+
+    Handler receives the method and its prepared parameters (as they would be sent)
+    and returns the result of the method in the JSON-compatible form
+    or :class:`MockResponse`, it can be a coroutine function.
+
+    .. code-block:: python
+
+        session = MockSession()
+        session.add_result(audio.GetCount, 42)
+
+        @session.handler(audio.Search)
+        def search(method: audio.Search, params: Dict[str, Any]) -> Any:
+            return {"count": 0, "items": []}
+
+        bot = VkBot("token", session=session)
+        assert await bot(audio.GetCount(owner_id=1)) == 42
+        assert session.requests[-1] == ("audio.getCount", {...})
+    """
+
+    def __init__(self, history_size: Optional[int] = 1000, **kwargs: Any) -> None:
+        """
+        :param history_size: Number of the last requests kept in :attr:`requests`,
+            unlimited when None
+        :param kwargs: Other arguments of :class:`BaseSession`
+        """
+        super().__init__(**kwargs)
+        self.handlers: Dict[str, MockHandler] = {}
+        self.contents: Dict[str, bytes] = {}
+        self.uploads: Dict[str, Any] = {}
+        self.requests: Deque[Tuple[str, Dict[str, Any]]] = deque(maxlen=history_size)
+
+    @staticmethod
+    def _key(method: MethodKey) -> str:
+        return method if isinstance(method, str) else method.__api_method__
+
+    def add_handler(self, method: MethodKey, handler: MockHandler) -> None:
+        """
+        Register handler of the API method
+
+        :param method: method class or API method name
+        :param handler: callable accepting method and prepared parameters
+        """
+        self.handlers[self._key(method)] = handler
+
+    def handler(self, method: MethodKey) -> Callable[[MockHandlerT], MockHandlerT]:
+        """
+        Decorator for handler registration
+
+        :param method: method class or API method name
+        """
+
+        def wrapper(handler: MockHandlerT) -> MockHandlerT:
+            self.add_handler(method, handler)
+            return handler
+
+        return wrapper
+
+    def add_result(self, method: MethodKey, result: Any) -> None:
+        """
+        Answer every call of the API method with the same result
+
+        :param method: method class or API method name
+        :param result: result in the JSON-compatible form or :class:`MockResponse`
+        """
+        self.add_handler(method, lambda *_: result)
+
+    def add_error(self, method: MethodKey, error_code: int, error_msg: str = "") -> None:
+        """
+        Fail every call of the API method with the Vk error
+
+        :param method: method class or API method name
+        :param error_code: Vk error code
+        :param error_msg: Vk error message
+        """
+        self.add_result(method, MockResponse(error_code=error_code, error_msg=error_msg))
+
+    def prepare_params(self, bot: VkBot, method: VkMethod[Any]) -> Dict[str, Any]:
+        """
+        Prepare parameters of the method the same way as they are sent by the real session
+
+        :param bot: Bot instance
+        :param method: Method instance
+        :return: parameters, files are replaced with :class:`InputFile` instances
+        """
+        files: Dict[str, InputFile] = {}
+        params: Dict[str, Any] = {"v": bot.api_version}
+        for key, value in method.model_dump(warnings=False).items():
+            value = self.prepare_value(value, bot=bot, files=files)
+            if not value:
+                continue
+            params[key] = value
+        params.update(files)
+        return params
+
+    async def _respond(self, bot: VkBot, method: VkMethod[Any]) -> MockResponse:
+        params = self.prepare_params(bot, method)
+        mark_stage("prepare")
+        self.requests.append((method.__api_method__, params))
+        handler = self.handlers.get(method.__api_method__)
+        if handler is None:
+            raise LookupError(f"No mock handler for {method.__api_method__}")
+        result = handler(method, params)
+        if inspect.isawaitable(result):
+            result = await result
+        response = result if isinstance(result, MockResponse) else MockResponse(result=result)
+        if response.delay:
+            await asyncio.sleep(response.delay)
+        return response
+
+    def _encode(self, response: MockResponse) -> str:
+        if response.error_code is not None:
+            payload: Dict[str, Any] = {
+                "error": {"error_code": response.error_code, "error_msg": response.error_msg}
+            }
+        else:
+            payload = {"response": response.result}
+        return self.json_dumps(payload)
+
+    async def close(self) -> None:
+        await self.stop_loop_monitor()
+
+    async def make_request(
+        self, bot: VkBot, method: VkMethod[VkType], timeout: Optional[TimeoutType] = None
+    ) -> VkType:
+        mark_stage("middlewares")
+        self.resolve_timeout(method, timeout)
+        response = await self._respond(bot, method)
+        content = self._encode(response)
+        mark_stage("network")
+        decoded = await self.decode_response(
+            bot=bot, method=method, status_code=response.status_code, content=content
+        )
+        mark_stage("decode")
+        return cast(VkType, decoded.response)
+
+    async def stream_response(
+        self,
+        bot: VkBot,
+        method: VkMethod[VkType],
+        timeout: Optional[TimeoutType] = None,
+        chunk_size: int = 65536,
+    ) -> AsyncGenerator[bytes, None]:
+        self.resolve_timeout(method, timeout)
+        response = await self._respond(bot, method)
+        content = self._encode(response)
+        if (
+            response.error_code is not None
+            or not HTTPStatus.OK <= response.status_code <= HTTPStatus.IM_USED
+        ):
+            self.check_response(
+                bot=bot, method=method, status_code=response.status_code, content=content
+            )
+        body = content.encode()
+        for offset in range(0, len(body), chunk_size):
+            yield body[offset : offset + chunk_size]
+
+    async def upload_file(
+        self,
+        bot: VkBot,
+        method: VkMethod[Any],
+        url: str,
+        files: Dict[str, InputFile],
+        timeout: Optional[TimeoutType] = None,
+    ) -> Any:
+        for value in files.values():
+            # Read files as the real upload does
+            async for _ in value.read(bot):
+                pass
+        if url not in self.uploads:
+            raise LookupError(f"No mock upload result for {url}")
+        return self.uploads[url]
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        if url not in self.contents:
+            raise LookupError(f"No mock content for {url}")
+        body = self.contents[url]
+        for offset in range(0, len(body), chunk_size):
+            yield body[offset : offset + chunk_size]
+
+
+async def measure_call_overhead(
+    method: VkMethod[Any], result: Any, calls: int = 10000, warmup_calls: int = 100
+) -> float:
+    """
+    Measure time spent by the library on one call of the method
+    without network: middlewares, preparation of the parameters, decoding and validation
+
+    :param method: Method instance
+    :param result: Result returned by the mock in the JSON-compatible form
+    :param calls: Number of measured calls
+    :param warmup_calls: Number of calls made before the measurement
+    :return: seconds per call
+    """
+    from ..bot import VkBot
+
+    session = MockSession(history_size=0)
+    session.add_result(type(method), result)
+    bot = VkBot("mock", session=session)
+    for _ in range(warmup_calls):
+        await bot(method)
+    started = time.perf_counter()
+    for _ in range(calls):
+        await bot(method)
+    return (time.perf_counter() - started) / calls
+
+
+def main(calls: int = 2000) -> None:
+    """
+    Print overhead per call of the typical methods
+
+    :param calls: Number of measured calls per method
+    """
+    from ...methods import audio
+
+    track = {
+        "id": 1,
+        "owner_id": 1,
+        "artist": "Artist",
+        "title": "Title",
+        "duration": 200,
+        "date": 1700000000,
+        "url": "https://example.com/track.mp3",
+    }
+    cases: List[Tuple[VkMethod[Any], Any]] = [
+        (audio.GetCount(owner_id=1), 1000),
+        (audio.Get(owner_id=1, count=100), {"count": 100, "items": [track] * 100}),
+    ]
+    for method, result in cases:
+        seconds = asyncio.run(measure_call_overhead(method, result, calls=calls))
+        print(f"  {seconds * 1e6:10.1f} us  {method.__api_method__}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
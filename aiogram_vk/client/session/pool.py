@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterator,
+    Optional,
+    Type,
+    cast,
+)
+
+from ...methods import VkMethod
+from ...methods.base import VkType
+from ...types import InputFile
+from ...utils.timeouts import TimeoutType
+from ...utils.token import token_label
+from .base import BaseSession
+
+if TYPE_CHECKING:
+    from ..bot import VkBot
+
+
+class PooledSession(BaseSession):
+    """
+    Session of one bot which sends requests through the shared session of the pool.
+
+    Has its own middlewares (for example rate limits of the token) and metrics,
+    while connections are shared with other bots of the pool.
+    Requests pass middlewares of the pooled session and then middlewares of the shared one,
+    they are counted in the metrics of both sessions.
+    """
+
+    def __init__(self, pool: SessionPool, label: str) -> None:
+        shared = pool.session
+        super().__init__(
+            api=shared.api,
+            json_loads=shared.json_loads,
+            json_dumps=shared.json_dumps,
+            timeout=shared.timeout,
+            decode_executor=shared.decode_executor,
+            decode_offload_threshold=shared.decode_offload_threshold,
+        )
+        self.pool = pool
+        self.label = label
+
+    @property
+    def shared(self) -> BaseSession:
+        return self.pool.session
+
+    async def close(self) -> None:
+        """
+        Shared session stays open, it is closed by :meth:`SessionPool.close`
+        """
+        pass
+
+    async def make_request(
+        self,
+        bot: VkBot,
+        method: VkMethod[VkType],
+        timeout: Optional[TimeoutType] = None,
+    ) -> VkType:
+        shared = self.shared
+        with shared.track_call(bot, method):
+            make_request = shared.middleware.wrap_middlewares(shared.make_request, timeout=timeout)
+            return cast(VkType, await make_request(bot, method))
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        stream = self.shared.stream_content(
+            url,
+            headers=headers,
+            timeout=timeout,
+            chunk_size=chunk_size,
+            raise_for_status=raise_for_status,
+        )
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def stream_response(
+        self,
+        bot: VkBot,
+        method: VkMethod[VkType],
+        timeout: Optional[TimeoutType] = None,
+        chunk_size: int = 65536,
+    ) -> AsyncGenerator[bytes, None]:
+        shared = self.shared
+        with shared.track_call(bot, method):
+            stream = shared.stream_response(bot, method, timeout=timeout, chunk_size=chunk_size)
+            try:
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                await stream.aclose()
+
+    async def upload_file(
+        self,
+        bot: VkBot,
+        method: VkMethod[Any],
+        url: str,
+        files: Dict[str, InputFile],
+        timeout: Optional[TimeoutType] = None,
+    ) -> Any:
+        return await self.shared.upload_file(bot, method, url, files, timeout=timeout)
+
+
+class SessionPool:
+    """
+    One connection pool for many bots.
+
+    Every bot gets its own :class:`PooledSession` with separate middlewares and metrics,
+    requests of all bots are sent through the single shared session,
+    so TLS connections and DNS lookups are reused between tokens.
+
+    .. code-block:: python
+
+        async with SessionPool() as pool:
+            bots = [pool.bot(token) for token in tokens]
+            ...
+            print(pool.metrics())
+    """
+
+    def __init__(self, session: Optional[BaseSession] = None) -> None:
+        """
+        :param session: Shared session, :class:`AiohttpSession` by default
+        """
+        if session is None:
+            from .aiohttp import AiohttpSession
+
+            session = AiohttpSession()
+        self.session = session
+        self._sessions: Dict[str, PooledSession] = {}
+
+    def get_session(self, token: str, label: Optional[str] = None) -> PooledSession:
+        """
+        Get session of the token, it is created on the first call
+
+        :param token: Access token
+        :param label: Name of the session in metrics, hash of the token by default
+        :return: pooled session
+        """
+        session = self._sessions.get(token)
+        if session is None:
+            session = self._sessions[token] = PooledSession(
+                self, label=label or token_label(token)
+            )
+        return session
+
+    def bot(self, token: str, label: Optional[str] = None, **kwargs: Any) -> VkBot:
+        """
+        Create bot using the pool
+
+        :param token: Access token
+        :param label: Name of the session in metrics, hash of the token by default
+        :param kwargs: Other arguments of :class:`VkBot`
+        :return: bot
+        """
+        from ..bot import VkBot
+
+        return VkBot(token, session=self.get_session(token, label=label), **kwargs)
+
+    def remove(self, token: str) -> None:
+        """
+        Forget session of the token
+
+        :param token: Access token
+        """
+        self._sessions.pop(token, None)
+
+    def __iter__(self) -> Iterator[PooledSession]:
+        return iter(list(self._sessions.values()))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of the metrics
+
+        :return: :code:`session` - metrics of the shared session,
+            :code:`bots` - metrics of the pooled sessions by their labels
+        """
+        return {
+            "session": self.session.metrics(),
+            "bots": {session.label: session.metrics() for session in self},
+        }
+
+    async def shutdown(self, timeout: Optional[float] = None) -> int:
+        """
+        Wait for the calls of all bots and close the shared session,
+        see :meth:`BaseSession.shutdown`.
+        Calls of the pooled sessions are tracked by the shared session,
+        so new calls of all bots are rejected while waiting
+
+        :param timeout: Maximum time to wait for the calls in seconds, wait forever by default
+        :return: number of aborted calls
+        """
+        return await self.session.shutdown(timeout=timeout)
+
+    async def close(self) -> None:
+        await self.session.close()
+
+    async def __aenter__(self) -> SessionPool:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
@@ -0,0 +1,583 @@
+"""
+Recording of the real API traffic and its offline replay.
+
+:class:`RecordingSession` writes every request of the bot to the cassette,
+JSON Lines file flushed after every record, so a crash loses at most the last one.
+Finished cassettes can be compressed with :func:`compress_cassette`,
+compressed and plain cassettes are read the same way.
+Tokens are not recorded, only API method names, parameters, responses and timings.
+
+:class:`ReplaySession` answers requests from the cassette without network,
+responses pass the same decoding and validation as the real ones.
+:func:`replay_traffic` sends recorded calls again with the original (or scaled) schedule
+to compare throughput and CPU usage of the library versions.
+
+.. code-block:: python
+
+    bot = VkBot(token, session=RecordingSession("traffic.jsonl"))
+    ...
+    compress_cassette("traffic.jsonl")
+
+    session = ReplaySession("traffic.jsonl.gz", latency_scale=1.0)
+    report = await replay_traffic(VkBot("replay", session=session), speed=10)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import heapq
+import itertools
+import json
+import os
+import shutil
+import time
+from collections import deque
+from contextvars import ContextVar
+from pathlib import Path
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+from urllib.parse import urlsplit
+
+from ...exceptions import VkAPIError, VkNetworkError
+from ...methods import Response, VkMethod
+from ...methods.base import VkType
+from ...types import InputFile
+from ...utils.timeouts import TimeoutType
+from .aiohttp import AiohttpSession
+from .base import BaseSession
+
+if TYPE_CHECKING:
+    from ..bot import VkBot
+
+CALL = "call"
+"Request made by :meth:`BaseSession.make_request`"
+STREAM = "stream"
+"Request made by :meth:`BaseSession.stream_response`"
+UPLOAD = "upload"
+"File upload made by :meth:`BaseSession.upload_file`"
+CONTENT = "content"
+"Download made by :meth:`BaseSession.stream_content`"
+
+_response: ContextVar[Optional[Dict[str, Any]]] = ContextVar("recorded_response", default=None)
+
+
+def _open_cassette(path: Union[str, Path]) -> IO[str]:
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return cast(IO[str], gzip.open(path, "rt", encoding="utf-8"))
+    return open(path, encoding="utf-8")
+
+
+def iter_cassette(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Read records of the cassette in the order of their start.
+
+    Records are written when requests are finished, so they are reordered on the fly:
+    every record holds the start time of the oldest request still in flight
+    and only records which can be preceded by the next ones are buffered.
+
+    :param path: cassette file, plain or gzip-compressed
+    """
+    buffer: List[Tuple[float, int, Dict[str, Any]]] = []
+    counter = itertools.count()
+    with _open_cassette(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Last record is cut off when the recording process is killed
+                continue
+            heapq.heappush(buffer, (record["t"], next(counter), record))
+            watermark = record.get("w")
+            while buffer and watermark is not None and buffer[0][0] < watermark:
+                yield heapq.heappop(buffer)[2]
+    while buffer:
+        yield heapq.heappop(buffer)[2]
+
+
+def compress_cassette(
+    path: Union[str, Path], destination: Optional[Union[str, Path]] = None
+) -> Path:
+    """
+    Compress finished cassette with gzip and remove the original
+
+    :param path: cassette file
+    :param destination: compressed file, :code:`.gz` is appended to the path by default
+    :return: path to the compressed cassette
+    """
+    path = Path(path)
+    target = Path(destination) if destination is not None else path.with_name(path.name + ".gz")
+    with path.open("rb") as src, gzip.open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    path.unlink()
+    return target
+
+
+def _method_params(method: VkMethod[Any]) -> Dict[str, Any]:
+    return method.model_dump(mode="json", exclude_none=True, warnings=False)
+
+
+def _content_key(url: str) -> str:
+    # Query holds session keys and changing parameters (Long Poll ts, etc.)
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def _call_key(api_method: str, params: Dict[str, Any]) -> str:
+    return f"{api_method} {json.dumps(params, sort_keys=True, separators=(',', ':'))}"
+
+
+class RecordingSession(AiohttpSession):
+    """
+    :class:`AiohttpSession` which writes all requests to the cassette
+    """
+
+    def __init__(self, cassette: Union[str, Path], sync: bool = False, **kwargs: Any) -> None:
+        """
+        :param cassette: Cassette file, records are appended to the existing one
+        :param sync: Also sync every record to the disk with :func:`os.fsync`,
+            records are only flushed to the OS by default
+        :param kwargs: Other arguments of :class:`AiohttpSession`
+        """
+        super().__init__(**kwargs)
+        self.cassette = Path(cassette)
+        self.sync = sync
+        self._file: Optional[IO[str]] = None
+        self._started: Optional[float] = None
+        self._active: Dict[float, int] = {}
+
+    def _start(self) -> float:
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        self._active[now] = self._active.get(now, 0) + 1
+        return now
+
+    def _release(self, started: float) -> None:
+        active = self._active[started] - 1
+        if active:
+            self._active[started] = active
+        else:
+            del self._active[started]
+
+    def _write(self, started: float, kind: str, **fields: Any) -> None:
+        if self._file is None:
+            self._file = open(self.cassette, "a", encoding="utf-8")
+        assert self._started is not None
+        now = time.monotonic()
+        self._release(started)
+        record = {
+            "t": round(started - self._started, 6),
+            "d": round(now - started, 6),
+            # Requests started before it are written already
+            "w": round(min(self._active, default=now) - self._started, 6),
+            "kind": kind,
+            **fields,
+        }
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+    async def decode_response(
+        self, bot: VkBot, method: VkMethod[VkType], status_code: int, content: str
+    ) -> Response[VkType]:
+        response = _response.get()
+        if response is not None:
+            response.update(status=status_code, body=content)
+        return await super().decode_response(
+            bot=bot, method=method, status_code=status_code, content=content
+        )
+
+    async def make_request(
+        self, bot: VkBot, method: VkMethod[VkType], timeout: Optional[TimeoutType] = None
+    ) -> VkType:
+        started = self._start()
+        response: Dict[str, Any] = {}
+        token = _response.set(response)
+        try:
+            return await super().make_request(bot, method, timeout=timeout)
+        except Exception as e:
+            if "body" not in response:
+                # Failed before the response was received
+                response["error"] = e.message if isinstance(e, VkNetworkError) else str(e)
+            raise
+        finally:
+            _response.reset(token)
+            self._write(
+                started,
+                CALL,
+                method=method.__api_method__,
+                params=_method_params(method),
+                **response,
+            )
+
+    async def stream_response(
+        self,
+        bot: VkBot,
+        method: VkMethod[VkType],
+        timeout: Optional[TimeoutType] = None,
+        chunk_size: int = 65536,
+    ) -> AsyncGenerator[bytes, None]:
+        started = self._start()
+        chunks: List[bytes] = []
+        response: Dict[str, Any] = {}
+        stream = super().stream_response(bot, method, timeout=timeout, chunk_size=chunk_size)
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+            response.update(status=200, body=b"".join(chunks).decode("utf-8", errors="replace"))
+        except VkNetworkError as e:
+            response["error"] = e.message
+            raise
+        except VkAPIError as e:
+            response.update(status=200, api_error=e.message, error_code=e.error_code)
+            raise
+        finally:
+            await stream.aclose()
+            if response:
+                self._write(
+                    started,
+                    STREAM,
+                    method=method.__api_method__,
+                    params=_method_params(method),
+                    **response,
+                )
+            else:
+                # Stream is closed before the end
+                self._release(started)
+
+    async def upload_file(
+        self,
+        bot: VkBot,
+        method: VkMethod[Any],
+        url: str,
+        files: Dict[str, InputFile],
+        timeout: Optional[TimeoutType] = None,
+    ) -> Any:
+        started = self._start()
+        response: Dict[str, Any] = {}
+        try:
+            response["result"] = await super().upload_file(
+                bot, method, url, files, timeout=timeout
+            )
+            return response["result"]
+        except VkNetworkError as e:
+            response["error"] = e.message
+            raise
+        except VkAPIError as e:
+            response["api_error"] = e.message
+            raise
+        finally:
+            self._write(started, UPLOAD, method=method.__api_method__, **response)
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        started = self._start()
+        chunks: List[bytes] = []
+        response: Dict[str, Any] = {}
+        stream = super().stream_content(
+            url,
+            headers=headers,
+            timeout=timeout,
+            chunk_size=chunk_size,
+            raise_for_status=raise_for_status,
+        )
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+            response["body"] = base64.b64encode(b"".join(chunks)).decode()
+        except Exception as e:
+            response["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            await stream.aclose()
+            if response:
+                self._write(started, CONTENT, url=_content_key(url), **response)
+            else:
+                self._release(started)
+
+    async def close(self) -> None:
+        await super().close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReplaySession(BaseSession):
+    """
+    Session answering requests with the recorded responses, network is never used.
+
+    Calls are matched by the API method and parameters,
+    identical calls get their responses in the recorded order,
+    so concurrent calls are answered independently.
+    Downloads are matched by the URL without query.
+
+    The cassette is read lazily: records are read ahead only until the matching one is found,
+    so memory is bounded by the distance between the recorded and the actual order of requests.
+    A request without recorded response reads the rest of the cassette.
+    """
+
+    def __init__(
+        self,
+        cassette: Union[str, Path],
+        latency_scale: Optional[float] = 1.0,
+        strict: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param cassette: Cassette file
+        :param latency_scale: Multiplier of the recorded response time,
+            responses are returned immediately when None
+        :param strict: Fail calls without recorded response with :class:`LookupError`,
+            otherwise any response of the same API method is returned
+        :param kwargs: Other arguments of :class:`BaseSession`
+        """
+        super().__init__(**kwargs)
+        self.cassette = Path(cassette)
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self._records = iter_cassette(cassette)
+        self._unused: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self._last: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def _read(self) -> bool:
+        record = next(self._records, None)
+        if record is None:
+            return False
+        if record["kind"] == CONTENT:
+            key = record["url"]
+        elif record["kind"] == UPLOAD:
+            key = record["method"]
+        else:
+            key = _call_key(record["method"], record["params"])
+        self._unused.setdefault((record["kind"], key), deque()).append(record)
+        if not self.strict:
+            self._last[(record["kind"], key.split(" ", 1)[0])] = record
+        return True
+
+    def _take(self, unused_key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        queue = self._unused.get(unused_key)
+        if not queue:
+            return None
+        record = queue.popleft()
+        if not queue:
+            del self._unused[unused_key]
+        return record
+
+    def _find(self, kind: str, key: str) -> Dict[str, Any]:
+        while True:
+            record = self._take((kind, key))
+            if record is not None:
+                return record
+            if not self._read():
+                break
+        if not self.strict:
+            # The whole cassette is read by now
+            prefix = key.split(" ", 1)[0]
+            for unused_key in list(self._unused):
+                if unused_key[0] == kind and unused_key[1].split(" ", 1)[0] == prefix:
+                    return cast(Dict[str, Any], self._take(unused_key))
+            last = self._last.get((kind, prefix))
+            if last is not None:
+                return last
+        raise LookupError(f"No recorded {kind} response for {key}")
+
+    def _find_call(self, kind: str, method: VkMethod[Any]) -> Dict[str, Any]:
+        return self._find(kind, _call_key(method.__api_method__, _method_params(method)))
+
+    async def _wait(self, record: Dict[str, Any]) -> None:
+        if self.latency_scale:
+            await asyncio.sleep(record["d"] * self.latency_scale)
+
+    async def close(self) -> None:
+        await self.stop_loop_monitor()
+
+    async def make_request(
+        self, bot: VkBot, method: VkMethod[VkType], timeout: Optional[TimeoutType] = None
+    ) -> VkType:
+        record = self._find_call(CALL, method)
+        await self._wait(record)
+        if "error" in record:
+            raise VkNetworkError(method=method, message=record["error"])
+        response = await self.decode_response(
+            bot=bot, method=method, status_code=record["status"], content=record["body"]
+        )
+        return cast(VkType, response.response)
+
+    async def stream_response(
+        self,
+        bot: VkBot,
+        method: VkMethod[VkType],
+        timeout: Optional[TimeoutType] = None,
+        chunk_size: int = 65536,
+    ) -> AsyncGenerator[bytes, None]:
+        record = self._find_call(STREAM, method)
+        await self._wait(record)
+        if "error" in record:
+            raise VkNetworkError(method=method, message=record["error"])
+        if "api_error" in record:
+            raise VkAPIError(
+                method=method, message=record["api_error"], error_code=record.get("error_code")
+            )
+        body = record["body"].encode()
+        for offset in range(0, len(body), chunk_size):
+            yield body[offset : offset + chunk_size]
+
+    async def upload_file(
+        self,
+        bot: VkBot,
+        method: VkMethod[Any],
+        url: str,
+        files: Dict[str, InputFile],
+        timeout: Optional[TimeoutType] = None,
+    ) -> Any:
+        record = self._find(UPLOAD, method.__api_method__)
+        await self._wait(record)
+        if "error" in record:
+            raise VkNetworkError(method=method, message=record["error"])
+        if "api_error" in record:
+            raise VkAPIError(method=method, message=record["api_error"])
+        return record["result"]
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        record = self._find(CONTENT, _content_key(url))
+        await self._wait(record)
+        if "error" in record:
+            raise OSError(record["error"])
+        body = base64.b64decode(record["body"])
+        for offset in range(0, len(body), chunk_size):
+            yield body[offset : offset + chunk_size]
+
+
+class ReplayReport(NamedTuple):
+    calls: int
+    "Replayed calls"
+    errors: int
+    "Calls finished with an error"
+    skipped: int
+    "Records of unknown API methods"
+    elapsed: float
+    "Wall time in seconds"
+    cpu_time: float
+    "CPU time of the process in seconds"
+
+    @property
+    def throughput(self) -> float:
+        """
+        Calls per second
+        """
+        return self.calls / self.elapsed if self.elapsed else 0.0
+
+
+def _method_types() -> Dict[str, Type[VkMethod[Any]]]:
+    from aiogram_vk.utils.warmup import iter_methods
+
+    return {method.__api_method__: method for method in iter_methods()}
+
+
+async def replay_traffic(
+    bot: VkBot,
+    cassette: Optional[Union[str, Path]] = None,
+    speed: Optional[float] = 1.0,
+    concurrency: int = 1000,
+) -> ReplayReport:
+    """
+    Make recorded calls and streamed requests again through the bot,
+    usually with :class:`ReplaySession`, to measure the client side costs.
+
+    :param bot: Bot instance
+    :param cassette: Cassette file, streamed from the disk.
+        By default the cassette of :class:`ReplaySession` of the bot is used
+    :param speed: Speed of the schedule relative to the recorded one,
+        calls are made as fast as possible when None
+    :param concurrency: Maximal number of concurrent calls
+    :return: report
+    """
+    if cassette is None:
+        if not isinstance(bot.session, ReplaySession):
+            raise TypeError("Cassette is required when the bot doesn't use ReplaySession")
+        cassette = bot.session.cassette
+
+    method_types = _method_types()
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def _replay(record: Dict[str, Any], method: VkMethod[Any]) -> None:
+        nonlocal errors
+        try:
+            if record["kind"] == STREAM:
+                async for _ in bot.session.stream_raw_items(bot, method):
+                    pass
+            else:
+                await bot(method)
+        except Exception:
+            errors += 1
+        finally:
+            semaphore.release()
+
+    loop = asyncio.get_running_loop()
+    # Finished tasks are dropped right away, at most `concurrency` of them are kept
+    tasks: Set[asyncio.Task[None]] = set()
+    calls = skipped = 0
+    cpu_started = time.process_time()
+    started = loop.time()
+    for record in iter_cassette(cassette):
+        if record["kind"] not in (CALL, STREAM):
+            continue
+        method_type = method_types.get(record["method"])
+        if method_type is None:
+            skipped += 1
+            continue
+        if speed:
+            delay = started + record["t"] / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await semaphore.acquire()
+        calls += 1
+        task = asyncio.create_task(_replay(record, method_type(**record["params"])))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+    return ReplayReport(
+        calls=calls,
+        errors=errors,
+        skipped=skipped,
+        elapsed=loop.time() - started,
+        cpu_time=time.process_time() - cpu_started,
+    )
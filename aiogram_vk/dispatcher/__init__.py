@@ -0,0 +1,12 @@
+from .dispatcher import Dispatcher
+from .long_poll import LongPoll, LongPollFailed
+from .supervisor import HashRing, PollingTarget, Supervisor
+
+__all__ = (
+    "Dispatcher",
+    "HashRing",
+    "LongPoll",
+    "LongPollFailed",
+    "PollingTarget",
+    "Supervisor",
+)
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from aiogram_vk import loggers
+from aiogram_vk.types import Update
+
+from .long_poll import LongPoll
+
+if TYPE_CHECKING:
+    from aiogram_vk.client.bot import VkBot
+
+UpdateHandler = Callable[[Update, "VkBot"], Awaitable[Any]]
+UpdateHandlerT = TypeVar("UpdateHandlerT", bound=UpdateHandler)
+
+
+class Dispatcher:
+    """
+    Routes updates to the handlers through the pool of workers.
+
+    Every worker has its own queue, updates are sharded between queues
+    by the peer ID, so updates of the same dialog are handled strictly in order
+    while different dialogs are handled concurrently.
+    Updates without peer are distributed round-robin.
+
+    Queues share the capacity of :code:`workers * queue_size` updates,
+    so a slow dialog doesn't block feeding of the other shards
+    until the dispatcher as a whole is full.
+    Then :code:`overflow` policy is applied: :code:`"wait"` makes :meth:`feed_update` wait,
+    so the Long Poll receiver stops requesting new updates until workers catch up,
+    :code:`"drop"` drops the update with a warning and never waits.
+
+    .. code-block:: python
+
+        dp = Dispatcher(workers=16)
+
+        @dp.update("message_new")
+        async def on_message(update: Update, bot: VkBot) -> None:
+            ...
+
+        await dp.start_polling(bot, group_id=group_id)
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        queue_size: int = 64,
+        overflow: Literal["wait", "drop"] = "wait",
+    ) -> None:
+        """
+        :param workers: Number of workers (and queues)
+        :param queue_size: Average number of updates waiting in the queue of one worker,
+            the dispatcher holds up to :code:`workers * queue_size` updates
+        :param overflow: What to do with new updates when the dispatcher is full:
+            :code:`"wait"` for free space or :code:`"drop"` them
+        """
+        if workers < 1:
+            raise ValueError("Dispatcher should have at least one worker")
+        if overflow not in ("wait", "drop"):
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.handlers: Dict[Optional[str], List[UpdateHandler]] = {}
+
+        self._queues: List[asyncio.Queue[Tuple[VkBot, Update]]] = []
+        self._capacity: Optional[asyncio.Semaphore] = None
+        self._tasks: List[asyncio.Task[None]] = []
+        self._round_robin = itertools.count()
+
+    def register(self, callback: UpdateHandlerT, *types: str) -> UpdateHandlerT:
+        """
+        Register update handler
+
+        :param callback: async callable accepting update and bot
+        :param types: update types to handle, all updates by default
+        :return: callback
+        """
+        for update_type in types or (None,):
+            self.handlers.setdefault(update_type, []).append(callback)
+        return callback
+
+    def update(self, *types: str) -> Callable[[UpdateHandlerT], UpdateHandlerT]:
+        """
+        Decorator for update handler registration
+
+        :param types: update types to handle, all updates by default
+        """
+
+        def wrapper(callback: UpdateHandlerT) -> UpdateHandlerT:
+            return self.register(callback, *types)
+
+        return wrapper
+
+    async def process_update(self, bot: VkBot, update: Update) -> bool:
+        """
+        Run handlers of the update one by one in the current task
+
+        :param bot: Bot instance
+        :param update: update
+        :return: whether the update was handled by any handler
+        """
+        handlers = [*self.handlers.get(update.type, ()), *self.handlers.get(None, ())]
+        for handler in handlers:
+            await handler(update, bot)
+        return bool(handlers)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def shard(self, update: Update) -> int:
+        """
+        Get index of the worker for the update
+
+        :param update: update
+        :return: worker index
+        """
+        peer_id = update.peer_id
+        if peer_id is None:
+            return next(self._round_robin) % self.workers
+        return hash(peer_id) % self.workers
+
+    async def feed_update(self, bot: VkBot, update: Update) -> bool:
+        """
+        Put update to the queue of its worker,
+        applies the overflow policy when the dispatcher is full
+
+        :param bot: Bot instance
+        :param update: update
+        :return: whether the update was queued
+        """
+        if not self.running:
+            self.start_workers()
+        capacity = self._capacity
+        assert capacity is not None
+        if capacity.locked() and self.overflow == "drop":
+            loggers.event.warning(
+                "Dispatcher is full, update %s of type %r is dropped",
+                update.event_id,
+                update.type,
+            )
+            return False
+        await capacity.acquire()
+        self._queues[self.shard(update)].put_nowait((bot, update))
+        return True
+
+    async def _worker(
+        self, queue: asyncio.Queue[Tuple[VkBot, Update]], capacity: asyncio.Semaphore
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            bot, update = await queue.get()
+            start_time = loop.time()
+            try:
+                handled = await self.process_update(bot, update)
+            except Exception as e:
+                loggers.event.exception(
+                    "Cause exception while process update %s of type %r: %s: %s",
+                    update.event_id,
+                    update.type,
+                    type(e).__name__,
+                    e,
+                )
+            else:
+                duration = (loop.time() - start_time) * 1000
+                loggers.event.debug(
+                    "Update %s of type %r is %s. Duration %d ms",
+                    update.event_id,
+                    update.type,
+                    "handled" if handled else "not handled",
+                    duration,
+                )
+            finally:
+                queue.task_done()
+                capacity.release()
+
+    def start_workers(self) -> None:
+        """
+        Start workers in the background tasks
+        """
+        if self.running:
+            return
+        capacity = asyncio.Semaphore(self.workers * self.queue_size)
+        self._capacity = capacity
+        self._queues = [asyncio.Queue() for _ in range(self.workers)]
+        self._tasks = [
+            asyncio.ensure_future(self._worker(queue, capacity)) for queue in self._queues
+        ]
+
+    async def stop_workers(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until queued updates are handled and stop workers
+
+        :param timeout: Maximum time to wait for queued updates in seconds,
+            unfinished handlers are cancelled after it. Wait forever by default
+        """
+        if not self.running:
+            return
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues)), timeout=timeout
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queues = []
+        self._capacity = None
+
+    async def feed_long_poll(self, long_poll: LongPoll) -> None:
+        """
+        Feed updates received by Long Poll to the workers until cancelled,
+        workers are not stopped on exit
+
+        :param long_poll: updates receiver
+        """
+        try:
+            async for update in long_poll.listen():
+                await self.feed_update(long_poll.bot, update)
+        finally:
+            await long_poll.stop()
+
+    async def start_polling(
+        self,
+        bot: VkBot,
+        group_id: Optional[int] = None,
+        close_timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Receive updates with Long Poll and handle them until cancelled
+
+        :param bot: Bot instance
+        :param group_id: Community ID for Bots Long Poll API, User Long Poll API by default
+        :param close_timeout: Maximum time to wait for queued updates on stop
+        :param kwargs: Other arguments of :class:`LongPoll`
+        """
+        loggers.dispatcher.info("Start polling")
+        self.start_workers()
+        try:
+            await self.feed_long_poll(LongPoll(bot, group_id=group_id, **kwargs))
+        finally:
+            await self.stop_workers(timeout=close_timeout)
+            loggers.dispatcher.info("Polling stopped")
+
+    def run_polling(self, bot: VkBot, group_id: Optional[int] = None, **kwargs: Any) -> None:
+        """
+        Run polling in the new event loop, session of the bot is closed on exit
+
+        :param bot: Bot instance
+        :param group_id: Community ID for Bots Long Poll API, User Long Poll API by default
+        :param kwargs: Other arguments of :meth:`start_polling`
+        """
+
+        async def _run() -> None:
+            async with bot:
+                await self.start_polling(bot, group_id=group_id, **kwargs)
+
+        with contextlib.suppress(KeyboardInterrupt, SystemExit):
+            asyncio.run(_run())
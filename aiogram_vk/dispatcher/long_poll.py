@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+from urllib.parse import urlencode
+
+from aiogram_vk import loggers
+from aiogram_vk.exceptions import ClientDecodeError, VkAPIError, VkNetworkError
+from aiogram_vk.methods import groups, messages
+from aiogram_vk.types import LongPollServer, Update
+
+if TYPE_CHECKING:
+    from aiogram_vk.client.bot import VkBot
+
+FATAL_ERROR_CODES: FrozenSet[int] = frozenset({3, 5, 7, 8, 15, 17, 18, 27, 28, 100, 203})
+"Errors which can't be fixed by retrying: unknown method, authorization and permission errors"
+
+
+class LongPollFailed(Exception):
+    """
+    Long Poll server responded with the failed code which can't be handled
+    """
+
+    def __init__(self, failed: int, response: Dict[str, Any]) -> None:
+        super().__init__(f"Long Poll server failed with code {failed}: {response}")
+        self.failed = failed
+        self.response = response
+
+
+class LongPoll:
+    """
+    Long Poll updates receiver.
+
+    Uses Bots Long Poll API when :code:`group_id` is passed
+    and User Long Poll API otherwise.
+
+    Polling is pipelined: received batch is put into the queue
+    and the next request is sent immediately,
+    so updates are received while the handlers of the previous batch are still running.
+    When the queue is full, polling waits for the consumer.
+
+    Events which can't be parsed are logged and skipped.
+    When the events history is lost (:code:`failed=1`), User Long Poll API
+    requests the missed events with :code:`messages.getLongPollHistory`,
+    Bots Long Poll API has no such method, so missed events are logged and skipped.
+
+    .. code-block:: python
+
+        long_poll = LongPoll(bot, group_id=group_id)
+        async for update in long_poll.listen():
+            ...
+    """
+
+    def __init__(
+        self,
+        bot: VkBot,
+        group_id: Optional[int] = None,
+        wait: int = 25,
+        mode: int = 2 | 8 | 32 | 64 | 128,
+        version: int = 3,
+        ts: Optional[Union[int, str]] = None,
+        queue_size: int = 4,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        fatal_error_codes: Iterable[int] = FATAL_ERROR_CODES,
+    ) -> None:
+        """
+        :param bot: Bot instance
+        :param group_id: Community ID for Bots Long Poll API
+        :param wait: Maximum time to wait for the events on the server side, in seconds
+        :param mode: Additional answer options, only for User Long Poll API
+        :param version: Long Poll version, only for User Long Poll API
+        :param ts: Event number to start from, by default from the current one
+        :param queue_size: Maximum number of received batches waiting for the consumer
+        :param backoff: Initial delay before retry after a failed request, in seconds
+        :param max_backoff: Maximum delay before retry, in seconds
+        :param fatal_error_codes: Vk error codes which stop polling,
+            other API errors (too many requests, flood control, etc.) are retried
+        """
+        self.bot = bot
+        self.group_id = group_id
+        self.wait = wait
+        self.mode = mode
+        self.version = version
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.fatal_error_codes = frozenset(fatal_error_codes)
+
+        self.server: Optional[LongPollServer] = None
+        self.ts = ts
+        """Event number of the last received batch"""
+        self.pts: Optional[int] = None
+        """Messages history position of the last received batch, only for User Long Poll API"""
+
+        self._queue: asyncio.Queue[Union[List[Update], BaseException]] = asyncio.Queue(
+            maxsize=queue_size
+        )
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def get_server(self) -> LongPollServer:
+        """
+        Request new Long Poll server key
+
+        :return: server connection data
+        """
+        method: Union[groups.GetLongPollServer, messages.GetLongPollServer]
+        if self.group_id is not None:
+            method = groups.GetLongPollServer(group_id=self.group_id)
+        else:
+            method = messages.GetLongPollServer(need_pts=True, lp_version=self.version)
+        return await self.bot(method)
+
+    def build_url(self, server: LongPollServer, ts: Union[int, str]) -> str:
+        """
+        Build URL of the Long Poll request
+
+        :param server: server connection data
+        :param ts: event number to start from
+        :return: URL
+        """
+        params: Dict[str, Any] = {"act": "a_check", "key": server.key, "ts": ts, "wait": self.wait}
+        if self.group_id is None:
+            params["mode"] = self.mode
+            params["version"] = self.version
+        url = server.server
+        if "://" not in url:
+            url = f"https://{url}"
+        return f"{url}?{urlencode(params)}"
+
+    async def request(self, server: LongPollServer, ts: Union[int, str]) -> Dict[str, Any]:
+        """
+        Send single Long Poll request
+
+        :param server: server connection data
+        :param ts: event number to start from
+        :return: decoded response
+        """
+        session = self.bot.session
+        content = bytearray()
+        async for chunk in session.stream_content(
+            self.build_url(server, ts), timeout=self.wait + 10, raise_for_status=True
+        ):
+            content += chunk
+        try:
+            data = session.json_loads(content)
+        except Exception as e:
+            raise ClientDecodeError("Failed to decode object", e, bytes(content))
+        if not isinstance(data, dict):
+            raise ClientDecodeError("Unexpected Long Poll response", TypeError(), data)
+        return data
+
+    def parse_updates(self, raw_updates: List[Any]) -> List[Update]:
+        """
+        Convert raw events to updates
+
+        :param raw_updates: events from the response
+        :return: updates
+        """
+        context = {"bot": self.bot}
+        updates = []
+        for event in raw_updates:
+            try:
+                if self.group_id is None:
+                    if not isinstance(event, list) or not event:
+                        continue
+                    update = Update.from_user_event(event).as_(self.bot)
+                else:
+                    update = Update.model_validate(event, context=context)
+            except (ValueError, TypeError) as e:
+                loggers.event.warning("Skipping malformed Long Poll event %r: %s", event, e)
+                continue
+            updates.append(update)
+        return updates
+
+    async def get_history(self, ts: Union[int, str], pts: int) -> List[Update]:
+        """
+        Request events missed since the position, only for User Long Poll API
+
+        :param ts: event number to start from
+        :param pts: messages history position to start from
+        :return: updates
+        """
+        raw_updates: List[Any] = []
+        while True:
+            history = await self.bot(
+                messages.GetLongPollHistory(ts=ts, pts=pts, lp_version=self.version)
+            )
+            raw_updates.extend(history.history)
+            if history.new_pts is not None:
+                self.pts = history.new_pts
+            if not history.more or history.new_pts is None or history.new_pts == pts:
+                break
+            pts = history.new_pts
+        return self.parse_updates(raw_updates)
+
+    async def _recover(self, new_ts: Union[int, str]) -> None:
+        if self.group_id is not None or self.ts is None or self.pts is None:
+            loggers.event.warning(
+                "Long Poll events history is lost, continue from ts=%s (was %s)",
+                new_ts,
+                self.ts,
+            )
+            return
+        try:
+            updates = await self.get_history(self.ts, self.pts)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            loggers.event.warning(
+                "Failed to request lost Long Poll events, continue from ts=%s (was %s): %s: %s",
+                new_ts,
+                self.ts,
+                type(e).__name__,
+                e,
+            )
+            return
+        loggers.event.info("Long Poll events history is lost, recovered %d events", len(updates))
+        if updates:
+            await self._queue.put(updates)
+
+    async def _poll(self) -> None:
+        delay = self.backoff
+        while True:
+            try:
+                if self.server is None:
+                    self.server = await self.get_server()
+                    if self.ts is None:
+                        self.ts = self.server.ts
+                    if self.pts is None:
+                        self.pts = self.server.pts
+                assert self.ts is not None
+                data = await self.request(self.server, self.ts)
+            except asyncio.CancelledError:
+                raise
+            except VkAPIError as e:
+                if not isinstance(e, VkNetworkError) and e.error_code in self.fatal_error_codes:
+                    # Can't get Long Poll server key (wrong token, no permissions, etc.)
+                    raise
+                loggers.event.warning("Long Poll request failed: %s", e)
+            except Exception as e:
+                loggers.event.warning("Long Poll request failed: %s: %s", type(e).__name__, e)
+            else:
+                delay = self.backoff
+                failed = data.get("failed")
+                if failed is None:
+                    updates = self.parse_updates(data.get("updates") or [])
+                    # Next request is sent right after the batch is queued,
+                    # handlers are run by the consumer meanwhile.
+                    # Event number is moved only after the batch is queued,
+                    # so the batch is requested again if polling is stopped before
+                    await self._queue.put(updates)
+                    self.ts = data["ts"]
+                    self.pts = data.get("pts", self.pts)
+                elif failed == 1:
+                    # Events history is outdated or partially lost,
+                    # request missed events and continue from the new number
+                    await self._recover(data["ts"])
+                    self.ts = data["ts"]
+                elif failed == 2:
+                    # Key has expired, keep the event number to not lose events
+                    loggers.event.info("Long Poll key has expired, requesting new one")
+                    self.server = None
+                elif failed == 3:
+                    # Information is lost, both key and event number should be requested again
+                    loggers.event.warning("Long Poll information is lost, reconnecting")
+                    self.server = None
+                    self.ts = None
+                    self.pts = None
+                else:
+                    raise LongPollFailed(failed, data)
+                continue
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_backoff)
+
+    async def _run(self) -> None:
+        try:
+            await self._poll()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._queue.put(e)
+
+    def start(self) -> None:
+        """
+        Start polling in the background task
+        """
+        if self.running:
+            return
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop polling, batches already received are kept in the queue
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def get_updates(self) -> List[Update]:
+        """
+        Get next batch of updates, polling is started if needed
+
+        :return: updates
+        """
+        if not self.running and self._queue.empty():
+            self.start()
+        batch = await self._queue.get()
+        if isinstance(batch, BaseException):
+            raise batch
+        return batch
+
+    async def listen(self) -> AsyncGenerator[Update, None]:
+        """
+        Iterate over received updates, polling is stopped when the iterator is closed
+        (use :code:`contextlib.aclosing` or call :meth:`stop` when breaking the loop)
+
+        :return: async iterator over updates
+        """
+        self.start()
+        try:
+            while True:
+                for update in await self.get_updates():
+                    yield update
+        finally:
+            await self.stop()
@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from aiogram_vk import loggers
+
+from .long_poll import LongPoll
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+    from aiogram_vk.client.session.base import BaseSession
+
+    from .dispatcher import Dispatcher
+
+T = TypeVar("T")
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing(Generic[T]):
+    """
+    Consistent hashing ring.
+
+    Every node is placed on the ring many times (virtual nodes),
+    so keys are spread evenly and only about :code:`1 / len(nodes)` of keys
+    move to another node when a node is added or removed.
+    """
+
+    def __init__(self, nodes: Iterable[T] = (), replicas: int = 128) -> None:
+        """
+        :param nodes: initial nodes, :code:`str()` of the node should be unique
+        :param replicas: number of virtual nodes per node
+        """
+        self.replicas = replicas
+        self._hashes: List[int] = []
+        self._nodes: List[T] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: T) -> None:
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            index = bisect.bisect(self._hashes, point)
+            self._hashes.insert(index, point)
+            self._nodes.insert(index, node)
+
+    def remove(self, node: T) -> None:
+        for index in reversed(range(len(self._nodes))):
+            if self._nodes[index] == node:
+                del self._hashes[index]
+                del self._nodes[index]
+
+    def get(self, key: Any) -> T:
+        """
+        Get node for the key
+
+        :param key: key, :code:`str()` of the key is hashed
+        :return: node
+        """
+        if not self._nodes:
+            raise LookupError("Hash ring is empty")
+        index = bisect.bisect(self._hashes, _hash(str(key))) % len(self._hashes)
+        return self._nodes[index]
+
+    def assign(self, keys: Iterable[Any], load_factor: float = 1.25) -> Dict[Any, T]:
+        """
+        Assign keys to nodes with bounded loads:
+        node takes at most :code:`ceil(len(keys) / len(nodes) * load_factor)` keys,
+        extra keys go to the next nodes on the ring.
+        Keeps assignments stable as plain consistent hashing
+        and balanced even for a small number of keys.
+
+        :param keys: keys to assign, :code:`str()` of the key is hashed
+        :param load_factor: allowed load of the node relative to the average, at least 1
+        :return: key to node mapping
+        """
+        keys = list(keys)
+        if not self._nodes:
+            raise LookupError("Hash ring is empty")
+        capacity = math.ceil(len(keys) / len(self) * max(load_factor, 1.0))
+        loads: Dict[T, int] = {}
+        result: Dict[Any, T] = {}
+        for key in sorted(keys, key=lambda k: _hash(str(k))):
+            index = bisect.bisect(self._hashes, _hash(str(key)))
+            while True:
+                node = self._nodes[index % len(self._nodes)]
+                if loads.get(node, 0) < capacity:
+                    break
+                index += 1
+            loads[node] = loads.get(node, 0) + 1
+            result[key] = node
+        return result
+
+    def __len__(self) -> int:
+        return len(set(self._nodes))
+
+
+class PollingTarget(NamedTuple):
+    """
+    Bot to receive updates for
+    """
+
+    token: str
+    "Access token"
+    group_id: Optional[int] = None
+    "Community ID for Bots Long Poll API, User Long Poll API is used by default"
+
+    @property
+    def key(self) -> str:
+        """
+        Sharding key
+        """
+        if self.group_id is not None:
+            return f"group:{self.group_id}"
+        return f"token:{_hash(self.token)}"
+
+
+async def _worker_main(
+    targets: Sequence[PollingTarget],
+    dispatcher_factory: Callable[[], Dispatcher],
+    session_factory: Optional[Callable[[], BaseSession]],
+    close_timeout: Optional[float],
+    polling_kwargs: Dict[str, Any],
+) -> None:
+    from aiogram_vk.client.bot import VkBot
+    from aiogram_vk.client.session.aiohttp import AiohttpSession
+
+    task = asyncio.current_task()
+    assert task is not None
+    loop = asyncio.get_running_loop()
+    with contextlib.suppress(NotImplementedError):
+        loop.add_signal_handler(signal.SIGTERM, task.cancel)
+
+    dispatcher = dispatcher_factory()
+    session = session_factory() if session_factory is not None else AiohttpSession()
+    bots = [VkBot(target.token, session=session) for target in targets]
+    dispatcher.start_workers()
+    tasks = [
+        asyncio.ensure_future(
+            dispatcher.feed_long_poll(LongPoll(bot, group_id=target.group_id, **polling_kwargs))
+        )
+        for bot, target in zip(bots, targets)
+    ]
+    try:
+        # Polling of one target failed: stop the others and exit,
+        # so the supervisor restarts the whole worker
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for finished in done:
+            error = None if finished.cancelled() else finished.exception()
+            if error is not None:
+                raise error
+    except asyncio.CancelledError:
+        pass
+    finally:
+        for pending in tasks:
+            pending.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await dispatcher.stop_workers(timeout=close_timeout)
+        await session.shutdown(timeout=close_timeout)
+
+
+def _run_worker(
+    index: int,
+    targets: Sequence[PollingTarget],
+    dispatcher_factory: Callable[[], Dispatcher],
+    session_factory: Optional[Callable[[], BaseSession]],
+    close_timeout: Optional[float],
+    warm: bool,
+    polling_kwargs: Dict[str, Any],
+) -> None:
+    # Only supervisor reacts on Ctrl+C, workers are stopped with SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if warm:
+        from aiogram_vk.utils.warmup import warmup
+
+        # Forked workers have everything built already, so this is cheap for them
+        warmup()
+    loggers.dispatcher.info(
+        "Worker %d (pid=%d) started with %d targets", index, os.getpid(), len(targets)
+    )
+    try:
+        asyncio.run(
+            _worker_main(
+                targets, dispatcher_factory, session_factory, close_timeout, polling_kwargs
+            )
+        )
+    except Exception:
+        loggers.dispatcher.exception("Worker %d (pid=%d) failed", index, os.getpid())
+        sys.exit(1)
+    loggers.dispatcher.info("Worker %d (pid=%d) stopped", index, os.getpid())
+
+
+class Supervisor:
+    """
+    Runs polling in several worker processes to use all CPU cores.
+
+    Every worker has its own event loop, session and dispatcher
+    and receives updates for its shard of targets.
+    Targets are assigned to workers with consistent hashing with bounded loads,
+    so changing the number of workers moves only a small part of them.
+    Crashed workers are restarted.
+
+    Factories are called in the worker processes,
+    they should be picklable (module-level functions) for the :code:`spawn` start method.
+
+    .. code-block:: python
+
+        def create_dispatcher() -> Dispatcher:
+            dp = Dispatcher()
+            dp.register(on_message, "message_new")
+            return dp
+
+        if __name__ == "__main__":
+            Supervisor(
+                create_dispatcher,
+                [PollingTarget(token, group_id=group_id) for token, group_id in groups],
+            ).run()
+    """
+
+    def __init__(
+        self,
+        dispatcher_factory: Callable[[], Dispatcher],
+        targets: Sequence[PollingTarget],
+        processes: Optional[int] = None,
+        session_factory: Optional[Callable[[], BaseSession]] = None,
+        start_method: Optional[str] = None,
+        warmup: bool = True,
+        close_timeout: Optional[float] = 30.0,
+        restart_delay: float = 1.0,
+        **polling_kwargs: Any,
+    ) -> None:
+        """
+        :param dispatcher_factory: Callable creating dispatcher in the worker
+        :param targets: Bots to receive updates for
+        :param processes: Number of workers, number of CPUs by default
+        :param session_factory: Callable creating session in the worker,
+            :class:`AiohttpSession` by default
+        :param start_method: :mod:`multiprocessing` start method, platform default by default
+        :param warmup: Build validators on start of the workers,
+            see :mod:`aiogram_vk.utils.warmup`
+        :param close_timeout: Time given to the workers to handle queued updates on stop
+        :param restart_delay: Delay before restart of the crashed worker, in seconds
+        :param polling_kwargs: Other arguments of :class:`LongPoll`
+        """
+        self.dispatcher_factory = dispatcher_factory
+        self.targets = list(targets)
+        self.processes = processes or os.cpu_count() or 1
+        self.session_factory = session_factory
+        self.close_timeout = close_timeout
+        self.restart_delay = restart_delay
+        self.warmup = warmup
+        self.polling_kwargs = polling_kwargs
+
+        self._context = multiprocessing.get_context(start_method)
+        self._workers: Dict[int, BaseProcess] = {}
+        self._stopping = False
+
+    def shards(self) -> List[List[PollingTarget]]:
+        """
+        Distribute targets between workers
+
+        :return: list of targets for every worker
+        """
+        # Workers are equal, so loads are strictly balanced
+        assignment = HashRing(range(self.processes)).assign(
+            (target.key for target in self.targets), load_factor=1.0
+        )
+        shards: List[List[PollingTarget]] = [[] for _ in range(self.processes)]
+        for target in self.targets:
+            shards[assignment[target.key]].append(target)
+        return shards
+
+    def _spawn(self, index: int, targets: List[PollingTarget]) -> None:
+        process = self._context.Process(  # type: ignore[attr-defined]
+            target=_run_worker,
+            args=(
+                index,
+                targets,
+                self.dispatcher_factory,
+                self.session_factory,
+                self.close_timeout,
+                self.warmup,
+                self.polling_kwargs,
+            ),
+            name=f"aiogram_vk-worker-{index}",
+        )
+        process.start()
+        self._workers[index] = process
+
+    def start(self) -> None:
+        """
+        Start workers
+        """
+        if self.warmup and self._context.get_start_method() == "fork":
+            # Build validators once, forked workers share them copy-on-write
+            from aiogram_vk.utils.warmup import prepare_for_fork
+
+            prepare_for_fork()
+
+        self._stopping = False
+        for index, targets in enumerate(self.shards()):
+            if targets:
+                self._spawn(index, targets)
+        loggers.dispatcher.info(
+            "Started %d workers for %d targets", len(self._workers), len(self.targets)
+        )
+
+    def watch(self) -> None:
+        """
+        Wait for workers and restart crashed ones until all of them exit normally
+        """
+        shards = self.shards()
+        while self._workers and not self._stopping:
+            sentinels = {process.sentinel: index for index, process in self._workers.items()}
+            for sentinel in wait(list(sentinels)):
+                index = sentinels[sentinel]  # type: ignore[index]
+                process = self._workers.pop(index)
+                process.join()
+                if process.exitcode == 0 or self._stopping:
+                    continue
+                loggers.dispatcher.error(
+                    "Worker %d exited with code %s, restarting in %.1f seconds",
+                    index,
+                    process.exitcode,
+                    self.restart_delay,
+                )
+                time.sleep(self.restart_delay)
+                self._spawn(index, shards[index])
+
+    def stop(self) -> None:
+        """
+        Stop workers gracefully, workers which don't exit in time are killed
+        """
+        self._stopping = True
+        for process in self._workers.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = (
+            None if self.close_timeout is None else time.monotonic() + self.close_timeout + 5
+        )
+        for process in self._workers.values():
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            process.join(timeout)
+            if process.is_alive():
+                loggers.dispatcher.warning(
+                    "Worker %s is not stopped in time, killing", process.name
+                )
+                process.kill()
+                process.join()
+        self._workers.clear()
+
+    def run(self) -> None:
+        """
+        Start workers and supervise them until interrupted
+        """
+        self.start()
+        try:
+            self.watch()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
@@ -59,9 +59,11 @@ class VkAPIError(DetailedAiogramError):
         self,
         method: VkMethod[VkType],
         message: str,
+        error_code: Optional[int] = None,
     ) -> None:
         super().__init__(message=message)
         self.method = method
+        self.error_code = error_code
 
     def __str__(self) -> str:
         original_message = super().__str__()
@@ -76,6 +78,23 @@ class VkNetworkError(VkAPIError):
     label = "HTTP Client says"
 
 
+class VkCircuitOpen(VkNetworkError):
+    """
+    Exception raised without request when circuit breaker of the method or host is open.
+    """
+
+    label = "Circuit breaker says"
+
+    def __init__(
+        self,
+        method: VkMethod[VkType],
+        message: str,
+        retry_after: float,
+    ) -> None:
+        super().__init__(method=method, message=f"{message}. Retry in {retry_after:.1f} seconds.")
+        self.retry_after = retry_after
+
+
 class VkRetryAfter(VkAPIError):
     """
     Exception raised when flood control exceeds.
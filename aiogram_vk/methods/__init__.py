@@ -1,10 +1,13 @@
-from . import account, audio
-from .base import Request, Response, VkMethod
+from . import account, audio, groups, messages
+from .base import Request, Response, VkMethod, get_response_type
 
 __all__ = (
     "account",
     "audio",
+    "groups",
+    "messages",
     "Request",
     "Response",
     "VkMethod",
+    "get_response_type",
 )
@@ -2,5 +2,7 @@ from .get import Get
 from .get_count import GetCount
 from .search import Search
 from .get_by_id import GetById
+from .get_upload_server import GetUploadServer
+from .save import Save
 
-__all__ = ("Get", "GetCount", "Search", "GetById")
+__all__ = ("Get", "GetCount", "Search", "GetById", "GetUploadServer", "Save")
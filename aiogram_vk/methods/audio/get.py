@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, Optional
 
-from aiogram_vk.types import VkObject
+from aiogram_vk.types import Audio, VkObject
 
+from ...utils.timeouts import RequestTimeout, TimeoutType
 from ..base import VkMethod
 
 
@@ -14,6 +15,8 @@ class Get(VkMethod[VkObject]):
 
     __returning__ = VkObject
     __api_method__ = "audio.get"
+    __item_type__ = Audio
+    __timeout__ = RequestTimeout(total=30.0, connect=5.0, sock_read=15.0)
 
     owner_id: int
     "ID of the user or community that owns the audio album(s). Use a negative value to designate a community ID."
@@ -21,6 +24,8 @@ class Get(VkMethod[VkObject]):
     "ID of the audio playlist, if needed"
     offset: Optional[int] = 0
     "Offset needed to return a specific subset of audios"
+    count: Optional[int] = None
+    "Number of audios to return, at most 6000"
 
     if TYPE_CHECKING:
 
@@ -30,11 +35,20 @@ class Get(VkMethod[VkObject]):
             owner_id: int,
             playlist_id: Optional[int] = None,
             offset: Optional[int] = 0,
+            count: Optional[int] = None,
             **__pydantic_kwargs: Any,
         ) -> None:
             super().__init__(
                 owner_id=owner_id,
                 playlist_id=playlist_id,
                 offset=offset,
+                count=count,
                 **__pydantic_kwargs,
             )
+
+    def get_timeout(self) -> Optional[TimeoutType]:
+        timeout = super().get_timeout()
+        if timeout is not None and self.count is not None and self.count > 2000:
+            # Large listings take seconds to build and transfer
+            return RequestTimeout.of(timeout).scale(self.count / 2000)
+        return timeout
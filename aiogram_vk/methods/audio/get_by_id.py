@@ -16,6 +16,8 @@ class GetById(VkMethod[List[Audio]]):
 
     __returning__ = List[Audio]
     __api_method__ = "audio.getById"
+    __item_type__ = Audio
+    __items_path__ = ("response",)
 
     audios: List[str]
     """IDs of audios to get information about. Sample "{owner_id}_{audio_id}"."""
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from ...utils.timeouts import RequestTimeout
 from ..base import VkMethod
 
 
@@ -12,6 +13,7 @@ class GetCount(VkMethod[int]):
 
     __returning__ = int
     __api_method__ = "audio.getCount"
+    __timeout__ = RequestTimeout(total=10.0, connect=3.0)
 
     owner_id: int
     "ID of the user or community that owns the audio album(s). Use a negative value to designate a community ID."
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from aiogram_vk.types import AudioUploadServer
+
+from ..base import VkMethod
+
+
+class GetUploadServer(VkMethod[AudioUploadServer]):
+    """
+    Returns the server address to upload audio files.
+
+    Source: https://dev.vk.com/ru/method/audio.getUploadServer
+    """
+
+    __returning__ = AudioUploadServer
+    __api_method__ = "audio.getUploadServer"
+
+    if TYPE_CHECKING:
+
+        def __init__(__pydantic__self__, **__pydantic_kwargs: Any) -> None:
+            super().__init__(**__pydantic_kwargs)
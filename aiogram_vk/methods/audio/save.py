@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional
+
+from aiogram_vk.types import Audio
+
+from ..base import VkMethod
+
+
+class Save(VkMethod[Audio]):
+    """
+    Saves audio file after successful uploading.
+
+    Source: https://dev.vk.com/ru/method/audio.save
+    """
+
+    __returning__ = Audio
+    __api_method__ = "audio.save"
+
+    server: int
+    "Upload server ID returned by the upload server"
+    audio: str
+    "Audio data returned by the upload server"
+    hash: str
+    "Hash returned by the upload server"
+    artist: Optional[str] = None
+    "Artist name, by default taken from ID3 tags"
+    title: Optional[str] = None
+    "Title, by default taken from ID3 tags"
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            __pydantic__self__,
+            *,
+            server: int,
+            audio: str,
+            hash: str,
+            artist: Optional[str] = None,
+            title: Optional[str] = None,
+            **__pydantic_kwargs: Any,
+        ) -> None:
+            super().__init__(
+                server=server,
+                audio=audio,
+                hash=hash,
+                artist=artist,
+                title=title,
+                **__pydantic_kwargs,
+            )
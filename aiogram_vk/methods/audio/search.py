@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Optional
 
-from aiogram_vk.types import AudioSearchResult
+from aiogram_vk.types import Audio, AudioSearchResult
 
 from ..base import VkMethod
 
@@ -13,6 +13,7 @@ class Search(VkMethod[AudioSearchResult]):
 
     __returning__ = AudioSearchResult
     __api_method__ = "audio.search"
+    __item_type__ = Audio
 
     q: str
     "Search query string"
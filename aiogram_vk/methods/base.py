@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -9,6 +10,8 @@ from typing import (
     Generator,
     Generic,
     Optional,
+    Tuple,
+    Type,
     TypeVar,
 )
 
@@ -17,8 +20,9 @@ from pydantic.functional_validators import model_validator
 
 from aiogram_vk.client.context_controller import BotContextController
 
-from ..types import InputFile, Error
+from ..types import Error, InputFile, VkObject
 from ..types.base import UNSET_TYPE
+from ..utils.timeouts import TimeoutType
 
 if TYPE_CHECKING:
     from ..client.bot import VkBot
@@ -44,11 +48,26 @@ class Response(BaseModel, Generic[VkType]):
         return self.error is None
 
 
+@lru_cache(maxsize=None)
+def get_response_type(returning: Any) -> Type[Response[Any]]:
+    """
+    Get parametrized response model for the method result type.
+
+    Pydantic keeps parametrized generic models in a weak cache,
+    so they are rebuilt after every garbage collection without this strong cache.
+
+    :param returning: :code:`__returning__` of the method
+    :return: response model
+    """
+    return Response[returning]
+
+
 class VkMethod(BotContextController, BaseModel, Generic[VkType], ABC):
     model_config = ConfigDict(
         extra="allow",
         populate_by_name=True,
         arbitrary_types_allowed=True,
+        defer_build=True,
     )
 
     lang: Optional[str] = "ru"
@@ -69,6 +88,13 @@ class VkMethod(BotContextController, BaseModel, Generic[VkType], ABC):
             return values
         return {k: v for k, v in values.items() if not isinstance(v, UNSET_TYPE)}
 
+    __item_type__: ClassVar[Optional[Type[VkObject]]] = None
+    """Type of items which can be streamed one by one from the response"""
+    __items_path__: ClassVar[Tuple[str, ...]] = ("response", "items")
+    """Path to the array of items in the response"""
+    __timeout__: ClassVar[Optional[TimeoutType]] = None
+    """Default timeout of the method, used when the session timeout is not set"""
+
     if TYPE_CHECKING:
         __returning__: ClassVar[type]
         __api_method__: ClassVar[str]
@@ -84,6 +110,15 @@ class VkMethod(BotContextController, BaseModel, Generic[VkType], ABC):
         def __api_method__(self) -> str:
             pass
 
+    def get_timeout(self) -> Optional[TimeoutType]:
+        """
+        Default timeout of the request, can depend on the parameters of the method.
+        Used only when the session timeout is not set
+
+        :return: timeout or None to use the default session timeout
+        """
+        return self.__timeout__
+
     async def emit(self, bot: VkBot) -> VkType:
         return await bot(self)
 
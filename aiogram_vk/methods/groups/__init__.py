@@ -0,0 +1,3 @@
+from .get_long_poll_server import GetLongPollServer
+
+__all__ = ("GetLongPollServer",)
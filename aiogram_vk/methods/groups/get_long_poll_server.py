@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from aiogram_vk.types import LongPollServer
+
+from ..base import VkMethod
+
+
+class GetLongPollServer(VkMethod[LongPollServer]):
+    """
+    Returns data required for connection to a Bots Long Poll API server.
+
+    Source: https://dev.vk.com/ru/method/groups.getLongPollServer
+    """
+
+    __returning__ = LongPollServer
+    __api_method__ = "groups.getLongPollServer"
+
+    group_id: int
+    "Community ID"
+
+    if TYPE_CHECKING:
+
+        def __init__(__pydantic__self__, *, group_id: int, **__pydantic_kwargs: Any) -> None:
+            super().__init__(group_id=group_id, **__pydantic_kwargs)
@@ -0,0 +1,4 @@
+from .get_long_poll_history import GetLongPollHistory
+from .get_long_poll_server import GetLongPollServer
+
+__all__ = ("GetLongPollHistory", "GetLongPollServer")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from aiogram_vk.types import LongPollHistory
+
+from ..base import VkMethod
+
+
+class GetLongPollHistory(VkMethod[LongPollHistory]):
+    """
+    Returns updates in user's private messages missed by the Long Poll client.
+
+    Source: https://dev.vk.com/ru/method/messages.getLongPollHistory
+    """
+
+    __returning__ = LongPollHistory
+    __api_method__ = "messages.getLongPollHistory"
+
+    ts: Union[int, str]
+    "Last event number received from the Long Poll server"
+    pts: Optional[int] = None
+    "Last pts value received from the Long Poll server or messages.getLongPollServer"
+    events_limit: Optional[int] = None
+    "Maximum number of events to return"
+    msgs_limit: Optional[int] = None
+    "Maximum number of messages to return"
+    group_id: Optional[int] = None
+    "Community ID, for community messages with a user access key"
+    lp_version: Optional[int] = 3
+    "Long Poll version"
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            __pydantic__self__,
+            *,
+            ts: Union[int, str],
+            pts: Optional[int] = None,
+            events_limit: Optional[int] = None,
+            msgs_limit: Optional[int] = None,
+            group_id: Optional[int] = None,
+            lp_version: Optional[int] = 3,
+            **__pydantic_kwargs: Any,
+        ) -> None:
+            super().__init__(
+                ts=ts,
+                pts=pts,
+                events_limit=events_limit,
+                msgs_limit=msgs_limit,
+                group_id=group_id,
+                lp_version=lp_version,
+                **__pydantic_kwargs,
+            )
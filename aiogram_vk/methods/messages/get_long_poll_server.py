@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional
+
+from aiogram_vk.types import LongPollServer
+
+from ..base import VkMethod
+
+
+class GetLongPollServer(VkMethod[LongPollServer]):
+    """
+    Returns data required for connection to a Long Poll server.
+
+    Source: https://dev.vk.com/ru/method/messages.getLongPollServer
+    """
+
+    __returning__ = LongPollServer
+    __api_method__ = "messages.getLongPollServer"
+
+    need_pts: Optional[bool] = None
+    "Return the pts field for messages.getLongPollHistory"
+    group_id: Optional[int] = None
+    "Community ID, for community messages with a user access key"
+    lp_version: Optional[int] = 3
+    "Long Poll version"
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            __pydantic__self__,
+            *,
+            need_pts: Optional[bool] = None,
+            group_id: Optional[int] = None,
+            lp_version: Optional[int] = 3,
+            **__pydantic_kwargs: Any,
+        ) -> None:
+            super().__init__(
+                need_pts=need_pts,
+                group_id=group_id,
+                lp_version=lp_version,
+                **__pydantic_kwargs,
+            )
@@ -3,11 +3,16 @@ from typing import List, Literal, Optional, Union
 from .account.info import AccountInfo
 from .account.user_settings import AccountUserSettings
 from .audio.audio import Audio
+from .audio.compact import AudioRecord, CompactAudioList
 from .audio.search_result import AudioSearchResult
+from .audio.upload import AudioUploadResult, AudioUploadServer
 from .base import UNSET_PARSE_MODE, VkObject
-from .custom import DateTime
+from .custom import DateTime, LazyUrl
 from .error import Error
 from .input_file import InputFile
+from .long_poll.history import LongPollHistory
+from .long_poll.server import LongPollServer
+from .long_poll.update import Update
 from .users.user_min import UserMin
 from .users.user_settings_xtr import UserSettingsXtr
 
@@ -15,30 +20,46 @@ __all__ = (
     "AccountInfo",
     "AccountUserSettings",
     "Audio",
+    "AudioRecord",
     "AudioSearchResult",
+    "AudioUploadResult",
+    "AudioUploadServer",
+    "CompactAudioList",
     "VkObject",
     "UNSET_PARSE_MODE",
     "Error",
     "DateTime",
+    "LazyUrl",
     "InputFile",
+    "LongPollHistory",
+    "LongPollServer",
+    "Update",
     "UserMin",
     "UserSettingsXtr",
 )
 
-# Load typing forward refs for every VkObject
-for _entity_name in __all__:
-    _entity = globals()[_entity_name]
-    if not hasattr(_entity, "model_rebuild"):
-        continue
-    _entity.model_rebuild(
-        _types_namespace={
-            "List": List,
-            "Optional": Optional,
-            "Union": Union,
-            "Literal": Literal,
-            **{k: v for k, v in globals().items() if k in __all__},
-        }
-    )
 
-del _entity
-del _entity_name
+def rebuild_entities() -> int:
+    """
+    Load typing forward refs and build validators for every VkObject.
+
+    Validators are built lazily on the first use,
+    use :func:`aiogram_vk.utils.warmup.warmup` to build everything at once.
+
+    :return: number of rebuilt entities
+    """
+    types_namespace = {
+        "List": List,
+        "Optional": Optional,
+        "Union": Union,
+        "Literal": Literal,
+        **{k: v for k, v in globals().items() if k in __all__},
+    }
+    count = 0
+    for entity_name in __all__:
+        entity = globals()[entity_name]
+        if not hasattr(entity, "model_rebuild"):
+            continue
+        entity.model_rebuild(_types_namespace=types_namespace)
+        count += 1
+    return count
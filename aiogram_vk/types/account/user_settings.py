@@ -1,11 +1,10 @@
 from typing import Optional
 
-from pydantic import AnyUrl
-
+from ..custom import LazyUrl
 from ..users.user_settings_xtr import UserSettingsXtr
 from ..users.user_min import UserMin
 
 
 class AccountUserSettings(UserMin, UserSettingsXtr):
-    photo_200: Optional[AnyUrl]
+    photo_200: Optional[LazyUrl]
     is_service_account: Optional[bool]
@@ -1,9 +1,7 @@
 from typing import Optional
 
-from pydantic import AnyUrl
-
 from aiogram_vk.types.base import VkObject
-from aiogram_vk.types.custom import DateTime
+from aiogram_vk.types.custom import DateTime, LazyUrl
 
 
 class Audio(VkObject):
@@ -17,8 +15,8 @@ class Audio(VkObject):
     "Audio owner's ID"
     title: str
     "Title"
-    url: Optional[AnyUrl] = None
-    "URL of mp3 file"
+    url: Optional[LazyUrl] = None
+    "URL of mp3 file, parsed on the first access"
     duration: int
     "Duration in seconds"
     stream_duration: Optional[int] = None
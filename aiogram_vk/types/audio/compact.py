@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from pydantic import AnyUrl
+
+from ..custom import parse_datetime, parse_url
+from .audio import Audio
+
+if TYPE_CHECKING:
+    from aiogram_vk.client.bot import VkBot
+
+_NULL: Final[int] = -(2**63)
+_UNSET: Any = object()
+
+_CORE_FIELDS: Final = frozenset(
+    {
+        "id",
+        "owner_id",
+        "artist",
+        "title",
+        "duration",
+        "url",
+        "date",
+        "access_key",
+        "album_id",
+        "genre_id",
+    }
+)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+class AudioRecord:
+    """
+    Compact representation of :class:`Audio` for bulk workloads.
+
+    Uses :code:`__slots__`, interns artist and title
+    and keeps URL and date raw until they are accessed.
+    Fields which are not stored in slots are kept in :code:`extra`.
+    """
+
+    __slots__ = (
+        "id",
+        "owner_id",
+        "artist",
+        "title",
+        "duration",
+        "access_key",
+        "album_id",
+        "genre_id",
+        "extra",
+        "raw_url",
+        "raw_date",
+        "_url",
+        "_date",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        owner_id: int,
+        artist: str,
+        title: str,
+        duration: int,
+        url: Optional[str] = None,
+        date: Optional[int] = None,
+        access_key: Optional[str] = None,
+        album_id: Optional[int] = None,
+        genre_id: Optional[int] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        :param id: Audio ID
+        :param owner_id: Audio owner's ID
+        :param artist: Artist name
+        :param title: Title
+        :param duration: Duration in seconds
+        :param url: Raw URL of mp3 file
+        :param date: Unix time when uploaded
+        :param access_key: Access key for the audio
+        :param album_id: Album ID
+        :param genre_id: Genre ID
+        :param extra: Other fields of the audio
+        """
+        self.id = id
+        self.owner_id = owner_id
+        self.artist = sys.intern(artist)
+        self.title = sys.intern(title)
+        self.duration = duration
+        self.access_key = access_key
+        self.album_id = album_id
+        self.genre_id = genre_id
+        self.extra = extra or None
+        self.raw_url = url
+        self.raw_date = date
+        self._url: Any = _UNSET
+        self._date: Any = _UNSET
+
+    @property
+    def url(self) -> Optional[AnyUrl]:
+        """
+        URL of mp3 file, parsed on the first access
+        """
+        if self._url is _UNSET:
+            self._url = None if self.raw_url is None else parse_url(self.raw_url)
+        return self._url  # type: ignore[no-any-return]
+
+    @property
+    def date(self) -> Optional[datetime]:
+        """
+        Date when uploaded, parsed on the first access
+        """
+        if self._date is _UNSET:
+            self._date = None if self.raw_date is None else parse_datetime(self.raw_date)
+        return self._date  # type: ignore[no-any-return]
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        """
+        Unique key of the audio
+        """
+        return self.owner_id, self.id
+
+    @classmethod
+    def from_raw(cls, data: Dict[str, Any]) -> AudioRecord:
+        """
+        Create record from decoded JSON object of the audio without validation
+
+        :param data: JSON object
+        :return: record
+        """
+        extra = {k: v for k, v in data.items() if k not in _CORE_FIELDS and v is not None}
+        return cls(
+            id=data["id"],
+            owner_id=data["owner_id"],
+            artist=data["artist"],
+            title=data["title"],
+            duration=data["duration"],
+            url=data.get("url"),
+            date=data.get("date"),
+            access_key=data.get("access_key"),
+            album_id=data.get("album_id"),
+            genre_id=data.get("genre_id"),
+            extra=extra,
+        )
+
+    @classmethod
+    def from_audio(cls, audio: Audio) -> AudioRecord:
+        """
+        Create record from the full model
+
+        :param audio: audio
+        :return: record
+        """
+        return cls.from_raw(audio.model_dump(mode="json", exclude_none=True, by_alias=True))
+
+    def to_raw(self) -> Dict[str, Any]:
+        """
+        Get JSON object of the audio
+
+        :return: JSON object
+        """
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "owner_id": self.owner_id,
+            "artist": self.artist,
+            "title": self.title,
+            "duration": self.duration,
+        }
+        for name, value in (
+            ("url", self.raw_url),
+            ("date", self.raw_date),
+            ("access_key", self.access_key),
+            ("album_id", self.album_id),
+            ("genre_id", self.genre_id),
+        ):
+            if value is not None:
+                data[name] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_audio(self, bot: Optional[VkBot] = None) -> Audio:
+        """
+        Convert record to the full model
+
+        :param bot: Bot instance to bind the model to
+        :return: audio
+        """
+        return Audio.model_validate(self.to_raw(), context={"bot": bot})
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, AudioRecord):
+            return NotImplemented
+        return self.to_raw() == other.to_raw()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(id={self.id!r}, owner_id={self.owner_id!r}, "
+            f"artist={self.artist!r}, title={self.title!r}, duration={self.duration!r})"
+        )
+
+
+class CompactAudioList(Sequence[AudioRecord]):
+    """
+    Container which stores audios in parallel arrays
+    instead of separate objects.
+
+    Integer fields are kept in contiguous 64-bit arrays,
+    artist and title are interned,
+    records are created only when items are accessed.
+
+    Fields which are not stored in slots of :class:`AudioRecord` are kept
+    in the sparse side table only for the items having them,
+    as tuples of values with names shared by all items with the same set of fields,
+    so the items are converted back to the same audios.
+    They can be dropped with :code:`keep_extra=False` to save memory.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Union[AudioRecord, Audio, Dict[str, Any]]] = (),
+        keep_extra: bool = True,
+    ) -> None:
+        """
+        :param items: records, full models or decoded JSON objects of audios
+        :param keep_extra: Keep fields which are not stored in slots of :class:`AudioRecord`,
+            when False they are lost and :meth:`to_audios` returns audios without them
+        """
+        self.keep_extra = keep_extra
+        self.ids: array[int] = array("q")
+        self.owner_ids: array[int] = array("q")
+        self.durations: array[int] = array("q")
+        self.dates: array[int] = array("q")
+        self.album_ids: array[int] = array("q")
+        self.genre_ids: array[int] = array("q")
+        self.artists: List[str] = []
+        self.titles: List[str] = []
+        self.urls: List[Optional[str]] = []
+        self.access_keys: List[Optional[str]] = []
+        self.extras: Dict[int, Tuple[Any, ...]] = {}
+        self._extra_names: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self.extend(items)
+
+    def append(self, item: Union[AudioRecord, Audio, Dict[str, Any]]) -> None:
+        """
+        Append audio
+
+        :param item: record, full model or decoded JSON object of the audio
+        """
+        if isinstance(item, Audio):
+            item = AudioRecord.from_audio(item)
+        elif isinstance(item, dict):
+            item = AudioRecord.from_raw(item)
+
+        self.ids.append(item.id)
+        self.owner_ids.append(item.owner_id)
+        self.durations.append(item.duration)
+        self.dates.append(_NULL if item.raw_date is None else item.raw_date)
+        self.album_ids.append(_NULL if item.album_id is None else item.album_id)
+        self.genre_ids.append(_NULL if item.genre_id is None else item.genre_id)
+        self.artists.append(item.artist)
+        self.titles.append(item.title)
+        self.urls.append(item.raw_url)
+        self.access_keys.append(_intern(item.access_key))
+        if self.keep_extra and item.extra:
+            names = tuple(item.extra)
+            names = self._extra_names.setdefault(names, names)
+            self.extras[len(self.ids) - 1] = (names, *item.extra.values())
+
+    def extend(self, items: Iterable[Union[AudioRecord, Audio, Dict[str, Any]]]) -> None:
+        """
+        Append audios
+
+        :param items: records, full models or decoded JSON objects of audios
+        """
+        for item in items:
+            self.append(item)
+
+    def to_audios(self, bot: Optional[VkBot] = None) -> List[Audio]:
+        """
+        Convert all items to the full models
+
+        :param bot: Bot instance to bind the models to
+        :return: list of audios
+        """
+        return [record.to_audio(bot=bot) for record in self]
+
+    def _record(self, index: int) -> AudioRecord:
+        date = self.dates[index]
+        album_id = self.album_ids[index]
+        genre_id = self.genre_ids[index]
+        extra = self.extras.get(index)
+        return AudioRecord(
+            id=self.ids[index],
+            owner_id=self.owner_ids[index],
+            artist=self.artists[index],
+            title=self.titles[index],
+            duration=self.durations[index],
+            url=self.urls[index],
+            date=None if date == _NULL else date,
+            access_key=self.access_keys[index],
+            album_id=None if album_id == _NULL else album_id,
+            genre_id=None if genre_id == _NULL else genre_id,
+            extra=None if extra is None else dict(zip(extra[0], extra[1:])),
+        )
+
+    @overload
+    def __getitem__(self, item: int) -> AudioRecord:
+        pass
+
+    @overload
+    def __getitem__(self, item: slice) -> CompactAudioList:
+        pass
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[AudioRecord, CompactAudioList]:
+        if isinstance(item, slice):
+            return CompactAudioList(
+                (self._record(index) for index in range(*item.indices(len(self)))),
+                keep_extra=self.keep_extra,
+            )
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("CompactAudioList index out of range")
+        return self._record(item)
+
+    def __iter__(self) -> Iterator[AudioRecord]:
+        for index in range(len(self)):
+            yield self._record(index)
+
+    def __len__(self) -> int:
+        return len(self.ids)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from ..base import VkObject
+
+
+class AudioUploadServer(VkObject):
+    """
+    Audio upload server
+    """
+
+    upload_url: str
+    "URL to upload the audio file to"
+
+
+class AudioUploadResult(VkObject):
+    """
+    Response of the audio upload server
+    """
+
+    server: int
+    "Upload server ID"
+    audio: str
+    "Uploaded audio data, should be passed to audio.save as is"
+    hash: str
+    "Upload hash"
+    redirect: Optional[str] = None
@@ -1,6 +1,18 @@
+from __future__ import annotations
+
+import re
 from datetime import datetime
+from typing import Any, Optional, Union, cast
 
-from pydantic import PlainSerializer
+from pydantic import (
+    AnyUrl,
+    GetCoreSchemaHandler,
+    GetJsonSchemaHandler,
+    PlainSerializer,
+    TypeAdapter,
+)
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import Url, core_schema
 from typing_extensions import Annotated
 
 # Make datetime compatible with Telegram Bot API (unixtime)
@@ -12,3 +24,100 @@ DateTime = Annotated[
         when_used="json-unless-none",
     ),
 ]
+
+_url_adapter: Optional[TypeAdapter[AnyUrl]] = None
+_datetime_adapter: Optional[TypeAdapter[datetime]] = None
+
+
+def parse_url(value: str) -> AnyUrl:
+    """
+    Parse URL the same way as :class:`pydantic.AnyUrl` field does
+    """
+    global _url_adapter
+    if _url_adapter is None:
+        _url_adapter = TypeAdapter(AnyUrl)
+    return _url_adapter.validate_python(value)
+
+
+def parse_datetime(value: Union[int, float, str, datetime]) -> datetime:
+    """
+    Parse datetime the same way as :class:`datetime.datetime` field does
+    """
+    global _datetime_adapter
+    if _datetime_adapter is None:
+        _datetime_adapter = TypeAdapter(datetime)
+    return _datetime_adapter.validate_python(value)
+
+
+_URL_FORMAT = re.compile(r"[A-Za-z][A-Za-z0-9+.\-]*://[^\s/?#]+[^\s]*\Z")
+
+
+class LazyUrl(str):
+    """
+    URL which is only checked for the format on validation
+    and is parsed on the first access to the attributes of :class:`pydantic.AnyUrl`
+    (:code:`host`, :code:`path`, :code:`query`, etc.), the result is cached.
+
+    It is a string with the raw value, so it can be used and serialized as a string.
+
+    .. warning::
+
+        Only the format (scheme and host) is checked when the model is built,
+        so invalid URLs are not rejected on validation anymore:
+        :class:`pydantic.ValidationError` is raised on the first access to the parsed URL instead.
+    """
+
+    @property
+    def parsed(self) -> AnyUrl:
+        try:
+            return cast(AnyUrl, self.__dict__["_parsed"])
+        except KeyError:
+            parsed = self.__dict__["_parsed"] = parse_url(str(self))
+            return parsed
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self.parsed, item)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self)!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Url):
+            return self.parsed == other
+        return str.__eq__(self, other)
+
+    __hash__ = str.__hash__
+
+    def __reduce__(self) -> Any:
+        return type(self), (str(self),)
+
+    @classmethod
+    def _validate(cls, value: Any) -> LazyUrl:
+        if isinstance(value, LazyUrl):
+            return value
+        if isinstance(value, Url):
+            return cls(str(value))
+        if not isinstance(value, str):
+            raise ValueError("URL should be a string")
+        if _URL_FORMAT.match(value) is None:
+            raise ValueError("Input should be a valid URL")
+        return cls(value)
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                str, when_used="unless-none"
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        return {"type": "string", "format": "uri"}
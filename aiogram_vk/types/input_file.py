@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import io
+import mmap
 import os
 from abc import ABC, abstractmethod
+from contextlib import suppress
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, Optional, Union
 
@@ -24,7 +25,8 @@ class InputFile(ABC):
     def __init__(self, filename: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
         """
         Base class for input files. Should not be used directly.
-        Look at :class:`BufferedInputFile`, :class:`FSInputFile` :class:`URLInputFile`
+        Look at :class:`BufferedInputFile`, :class:`FSInputFile`, :class:`MmapInputFile`,
+        :class:`URLInputFile`
 
         :param filename: name of the given file
         :param chunk_size: reader chunks size
@@ -36,6 +38,16 @@ class InputFile(ABC):
     async def read(self, bot: "VkBot") -> AsyncGenerator[bytes, None]:  # pragma: no cover
         yield b""
 
+    def size(self) -> Optional[int]:
+        """
+        Size of the file in bytes if it is known before reading.
+
+        Used to send uploads with explicit content length instead of chunked transfer encoding.
+
+        :return: size in bytes or None
+        """
+        return None
+
 
 class BufferedInputFile(InputFile):
     def __init__(self, file: bytes, filename: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
@@ -60,6 +72,9 @@ class BufferedInputFile(InputFile):
         """
         Create buffer from file
 
+        Whole file is read into memory, for large files
+        consider :class:`MmapInputFile` or :class:`FSInputFile` instead.
+
         :param path: Path to file
         :param filename: Filename to be propagated to telegram.
             By default, will be parsed from path
@@ -72,10 +87,14 @@ class BufferedInputFile(InputFile):
             data = f.read()
         return cls(data, filename=filename, chunk_size=chunk_size)
 
+    def size(self) -> Optional[int]:
+        return memoryview(self.data).nbytes
+
     async def read(self, bot: "VkBot") -> AsyncGenerator[bytes, None]:
-        buffer = io.BytesIO(self.data)
-        while chunk := buffer.read(self.chunk_size):
-            yield chunk
+        # Slices of memoryview share the underlying buffer, so chunks are not copied
+        view = memoryview(self.data)
+        for offset in range(0, len(view), self.chunk_size):
+            yield view[offset : offset + self.chunk_size]
 
 
 class FSInputFile(InputFile):
@@ -99,12 +118,63 @@ class FSInputFile(InputFile):
 
         self.path = path
 
+    def size(self) -> Optional[int]:
+        return os.path.getsize(self.path)
+
     async def read(self, bot: "VkBot") -> AsyncGenerator[bytes, None]:
         async with aiofiles.open(self.path, "rb") as f:
             while chunk := await f.read(self.chunk_size):
                 yield chunk
 
 
+class MmapInputFile(InputFile):
+    def __init__(
+        self,
+        path: Union[str, Path],
+        filename: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Represents object for uploading large files from filesystem
+        using memory-mapping, so file content is never copied into process memory
+
+        :param path: Path to file
+        :param filename: Filename to be propagated to telegram.
+            By default, will be parsed from path
+        :param chunk_size: Uploading chunk size
+        """
+        if filename is None:
+            filename = os.path.basename(path)
+        super().__init__(filename=filename, chunk_size=chunk_size)
+
+        self.path = path
+
+    def size(self) -> Optional[int]:
+        return os.path.getsize(self.path)
+
+    async def read(self, bot: "VkBot") -> AsyncGenerator[bytes, None]:
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                # Empty files can't be mapped
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+
+        view = memoryview(mapped)
+        try:
+            for offset in range(0, size, self.chunk_size):
+                yield view[offset : offset + self.chunk_size]
+        finally:
+            view.release()
+            # Chunks still referenced by transport buffers keep the mapping alive,
+            # in this case it will be unmapped by garbage collector after them
+            with suppress(BufferError):
+                mapped.close()
+
+
 class URLInputFile(InputFile):
     def __init__(
         self,
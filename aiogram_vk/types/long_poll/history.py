@@ -0,0 +1,24 @@
+from typing import Any, Dict, List, Optional
+
+from ..base import VkObject
+
+
+class LongPollHistory(VkObject):
+    """
+    User Long Poll events history
+
+    Source: https://dev.vk.com/ru/method/messages.getLongPollHistory
+    """
+
+    history: List[List[Any]] = []
+    "Events in the User Long Poll format"
+    messages: Optional[Dict[str, Any]] = None
+    "Messages of the events"
+    profiles: Optional[List[Dict[str, Any]]] = None
+    "Users mentioned in the messages"
+    groups: Optional[List[Dict[str, Any]]] = None
+    "Communities mentioned in the messages"
+    new_pts: Optional[int] = None
+    "Value of pts to request the next part of the history from"
+    more: Optional[bool] = None
+    "Not all events were returned"
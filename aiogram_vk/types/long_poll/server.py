@@ -0,0 +1,20 @@
+from typing import Optional, Union
+
+from ..base import VkObject
+
+
+class LongPollServer(VkObject):
+    """
+    Long Poll server connection data
+
+    Source: https://dev.vk.com/ru/api/user-long-poll/getting-started
+    """
+
+    key: str
+    "Secret session key"
+    server: str
+    "Server address"
+    ts: Union[int, str]
+    "Number of the last event to start receiving data from"
+    pts: Optional[int] = None
+    "Value for messages.getLongPollHistory, returned only with need_pts"
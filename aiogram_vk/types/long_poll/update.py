@@ -0,0 +1,75 @@
+from typing import Any, Dict, Final, List, Optional
+
+from ..base import VkObject
+
+USER_EVENT_PEER_INDEX: Final[Dict[int, int]] = {
+    1: 3,
+    2: 3,
+    3: 3,
+    4: 3,
+    5: 3,
+    6: 1,
+    7: 1,
+    10: 1,
+    11: 1,
+    12: 1,
+    13: 1,
+    14: 1,
+    18: 3,
+    19: 3,
+    63: 1,
+    64: 1,
+}
+"Position of the peer ID in the user Long Poll events by the event code"
+
+
+class Update(VkObject):
+    """
+    Event received from the Long Poll server.
+
+    Group events (Bots Long Poll API and Callback API) are stored as is,
+    user events are arrays, their code is stored as :code:`type`
+    and the array itself as :code:`object`.
+
+    Source: https://dev.vk.com/ru/api/community-events/json-schema
+    """
+
+    type: str
+    "Event type"
+    object: Optional[Any] = None
+    "Event object"
+    group_id: Optional[int] = None
+    "Community ID, only for group events"
+    event_id: Optional[str] = None
+    "Unique event ID, only for group events"
+    v: Optional[str] = None
+    "API version of the event, only for group events"
+
+    @classmethod
+    def from_user_event(cls, event: List[Any]) -> "Update":
+        """
+        Create update from the user Long Poll event
+
+        :param event: event array, the first item is the event code
+        :return: update
+        """
+        return cls(type=str(event[0]), object=event)
+
+    @property
+    def peer_id(self) -> Optional[int]:
+        """
+        ID of the dialog the event belongs to, if any
+        """
+        obj = self.object
+        if isinstance(obj, list):
+            index = USER_EVENT_PEER_INDEX.get(obj[0])
+            if index is None or len(obj) <= index:
+                return None
+            return int(obj[index])
+        if isinstance(obj, dict):
+            message = obj.get("message")
+            if isinstance(message, dict) and "peer_id" in message:
+                return int(message["peer_id"])
+            if "peer_id" in obj:
+                return int(obj["peer_id"])
+        return None
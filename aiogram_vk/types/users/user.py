@@ -1,7 +1,6 @@
 from typing import Any, Optional
 
-from pydantic import AnyUrl
-
+from ..custom import LazyUrl
 from .user_min import UserMin
 
 
@@ -10,9 +9,9 @@ class User(UserMin):
     "User sex"
     screen_name: Optional[str] = None
     "Domain name of the user's page"
-    photo_50: Optional[AnyUrl] = None
+    photo_50: Optional[LazyUrl] = None
     "URL of square photo of the user with 50 pixels in width"
-    photo_100: Optional[AnyUrl] = None
+    photo_100: Optional[LazyUrl] = None
     "URL of square photo of the user with 100 pixels in width"
     online_info: Optional[Any] = None  # users_online_info
     online: Optional[bool] = None
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Final, Iterable, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from aiogram_vk.client.bot import VkBot
+    from aiogram_vk.methods import VkMethod
+
+AUDIO_NUMERIC_FIELDS: Final = ("id", "owner_id", "duration", "date", "genre_id")
+AUDIO_STRING_FIELDS: Final = ("artist", "title")
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError(
+            "In order to export columns to NumPy, install https://pypi.org/project/numpy/"
+        ) from exc
+    return numpy
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow  # type: ignore
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError(
+            "In order to export columns to Arrow, install https://pypi.org/project/pyarrow/"
+        ) from exc
+    return pyarrow
+
+
+class AudioColumns:
+    """
+    Columnar storage of audio listings built straight from the raw JSON items,
+    :class:`aiogram_vk.types.Audio` objects are never created.
+
+    Numeric fields are stored in contiguous 64-bit integer arrays
+    (missing values are replaced with :code:`missing` and marked in the null mask),
+    string fields are stored in lists.
+
+    .. code-block:: python
+
+        columns = await fetch_audio_columns(bot, audio.Get(owner_id=owner_id))
+        table = columns.to_arrow()
+    """
+
+    def __init__(
+        self,
+        numeric_fields: Sequence[str] = AUDIO_NUMERIC_FIELDS,
+        string_fields: Sequence[str] = AUDIO_STRING_FIELDS,
+        missing: int = 0,
+    ) -> None:
+        """
+        :param numeric_fields: Integer fields to collect
+        :param string_fields: String fields to collect
+        :param missing: Value stored in numeric columns instead of missing values
+        """
+        self.missing = missing
+        self.numeric: Dict[str, array[int]] = {name: array("q") for name in numeric_fields}
+        self.nulls: Dict[str, bytearray] = {name: bytearray() for name in numeric_fields}
+        self.strings: Dict[str, List[Optional[str]]] = {name: [] for name in string_fields}
+        self._length = 0
+        self._frozen = False
+
+    @property
+    def frozen(self) -> bool:
+        """
+        Columns are frozen after zero-copy export, see :meth:`to_numpy`
+        """
+        return self._frozen
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, item: Dict[str, Any]) -> None:
+        """
+        Append raw audio item
+
+        :param item: decoded JSON object of the audio
+        :raise RuntimeError: when columns are frozen
+        """
+        if self._frozen:
+            raise RuntimeError(
+                "Columns were exported without copying and can't be changed, "
+                "export them with copy=True to keep appending"
+            )
+        missing = self.missing
+        for name, values in self.numeric.items():
+            value = item.get(name)
+            if value is None:
+                values.append(missing)
+                self.nulls[name].append(1)
+            else:
+                values.append(value)
+                self.nulls[name].append(0)
+        for name, strings in self.strings.items():
+            strings.append(item.get(name))
+        self._length += 1
+
+    def extend(self, items: Iterable[Dict[str, Any]]) -> None:
+        """
+        Append raw audio items
+
+        :param items: decoded JSON objects of the audios
+        """
+        for item in items:
+            self.append(item)
+
+    def _numeric_array(self, numpy: Any, name: str, copy: bool) -> Any:
+        view = numpy.frombuffer(self.numeric[name], dtype=numpy.int64)
+        return view.copy() if copy else view
+
+    def to_numpy(self, copy: bool = True) -> Dict[str, Any]:
+        """
+        Export columns to NumPy arrays.
+
+        Numeric columns are :code:`int64` arrays, string columns are object arrays.
+
+        :param copy: Copy numeric columns. Without copying they are views of the underlying
+            buffers, which can't be resized while the views exist,
+            so the columns are frozen: :meth:`append` and :meth:`extend` raise an error
+        :return: column name to array mapping
+        """
+        if not copy:
+            self._frozen = True
+        return self._to_numpy(_import_numpy(), copy)
+
+    def _to_numpy(self, numpy: Any, copy: bool) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            name: self._numeric_array(numpy, name, copy) for name in self.numeric
+        }
+        for name, strings in self.strings.items():
+            result[name] = numpy.array(strings, dtype=object)
+        return result
+
+    def to_records(self) -> Any:
+        """
+        Export columns to NumPy record array, the data is always copied
+
+        :return: :class:`numpy.recarray`
+        """
+        numpy = _import_numpy()
+        # Views are copied into the record array and released right away
+        columns = self._to_numpy(numpy, copy=False)
+        return numpy.rec.fromarrays(list(columns.values()), names=list(columns.keys()))
+
+    def to_arrow(self, copy: bool = True) -> Any:
+        """
+        Export columns to Arrow table, missing values are exported as nulls
+
+        :param copy: Copy numeric columns, see :meth:`to_numpy`
+        :return: :class:`pyarrow.Table`
+        """
+        numpy = _import_numpy()
+        pyarrow = _import_pyarrow()
+        if not copy:
+            self._frozen = True
+        arrays = []
+        for name in self.numeric:
+            mask = numpy.array(self.nulls[name], dtype=numpy.bool_)
+            arrays.append(
+                pyarrow.array(
+                    self._numeric_array(numpy, name, copy),
+                    type=pyarrow.int64(),
+                    mask=mask if mask.any() else None,
+                )
+            )
+        for strings in self.strings.values():
+            arrays.append(pyarrow.array(strings, type=pyarrow.string()))
+        return pyarrow.Table.from_arrays(
+            arrays, names=[*self.numeric.keys(), *self.strings.keys()]
+        )
+
+
+async def fetch_audio_columns(
+    bot: VkBot,
+    *methods: VkMethod[Any],
+    columns: Optional[AudioColumns] = None,
+    request_timeout: Optional[int] = None,
+) -> AudioColumns:
+    """
+    Call audio listing methods (:class:`aiogram_vk.methods.audio.Get`,
+    :class:`aiogram_vk.methods.audio.Search`, etc.) and collect
+    their items into columns while responses are being received.
+
+    :param bot: Bot instance
+    :param methods: Methods to call one by one, for example pages of the listing
+    :param columns: Columns to append to, new ones are created by default
+    :param request_timeout: Request timeout
+    :return: collected columns
+    """
+    if columns is None:
+        columns = AudioColumns()
+    for method in methods:
+        async for item in bot.session.stream_raw_items(bot, method, timeout=request_timeout):
+            columns.append(item)
+    return columns
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+
+class TransferStats:
+    """
+    Sizes of the received bodies.
+
+    Size on the network is counted from the raw body before it is decompressed,
+    so responses with chunked transfer encoding are measured too.
+    """
+
+    __slots__ = ("responses", "compressed", "uncompressed")
+
+    def __init__(self) -> None:
+        self.responses = 0
+        self.compressed = 0
+        "Bytes received from the network"
+        self.uncompressed = 0
+        "Bytes after decompression"
+
+    def add(self, compressed: int, uncompressed: int) -> None:
+        """
+        Count received body
+
+        :param compressed: size on the network
+        :param uncompressed: size after decompression
+        """
+        self.compressed += compressed
+        self.uncompressed += uncompressed
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "responses": self.responses,
+            "compressed": self.compressed,
+            "uncompressed": self.uncompressed,
+            "ratio": self.uncompressed / self.compressed if self.compressed else None,
+        }
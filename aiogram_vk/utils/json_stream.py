@@ -0,0 +1,196 @@
+import codecs
+import json
+import re
+from typing import Any, List, Optional, Sequence, Tuple
+
+_STRUCTURAL = re.compile(r'["{}\[\],]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+_PREFIX = 0
+_ITEMS = 1
+_SUFFIX = 2
+
+
+class JsonItemsParser:
+    """
+    Incremental JSON parser which extracts items of the array located at the given path
+    while the document is being received.
+
+    Items are decoded one by one as soon as they are complete,
+    everything outside the array (the envelope) is kept
+    and can be decoded after the end of the document
+    with the array replaced by an empty one.
+
+    .. code-block:: python
+
+        parser = JsonItemsParser(("response", "items"))
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+        envelope = parser.close()  # '{"response": {"count": 10, "items": []}}'
+    """
+
+    def __init__(self, path: Sequence[str]) -> None:
+        """
+        :param path: Keys of nested objects leading to the array
+        """
+        self.path = tuple(path)
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _PREFIX
+        # Path of every open container, None for containers which can't lead to the array
+        self._stack: List[Tuple[bool, Optional[Tuple[str, ...]]]] = []
+        self._key: Optional[str] = None
+        self._expect_key = False
+        self._envelope: List[str] = []
+
+    @property
+    def found(self) -> bool:
+        """
+        Array was found in the document
+        """
+        return self._state != _PREFIX
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Feed next chunk of the document
+
+        :param data: chunk
+        :return: items completed by this chunk
+        """
+        self._buffer += self._decoder.decode(data)
+        return self._process(final=False)
+
+    def close(self) -> str:
+        """
+        Finish the document
+
+        :return: the envelope
+        :raise ValueError: when document is incomplete
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        items = self._process(final=True)
+        if items or self._state == _ITEMS:
+            raise ValueError("Unexpected end of JSON document inside of the array")
+        self._envelope.append(self._buffer[self._pos :])
+        return "".join(self._envelope)
+
+    def _process(self, final: bool) -> List[Any]:
+        items: List[Any] = []
+        while self._pos < len(self._buffer):
+            if self._state == _ITEMS:
+                if not self._read_items(items, final=final):
+                    break
+            elif not self._scan(final=final):
+                break
+
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+        return items
+
+    def _scan(self, final: bool) -> bool:
+        """
+        Scan the envelope until the array is found or more data is needed
+        """
+        buffer = self._buffer
+        start = pos = self._pos
+        entered = False
+        while True:
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+
+            index = match.start()
+            char = buffer[index]
+            if char == '"':
+                end = self._find_string_end(buffer, index + 1)
+                if end is None:
+                    if final:
+                        raise ValueError("Unterminated string in JSON document")
+                    pos = index
+                    break
+                if self._expect_key:
+                    self._key = json.loads(buffer[index : end + 1])
+                    self._expect_key = False
+                pos = end + 1
+                continue
+
+            pos = index + 1
+            if char == "{" or char == "[":
+                is_object = char == "{"
+                path: Optional[Tuple[str, ...]] = None
+                if not self._stack:
+                    path = ()
+                else:
+                    parent_is_object, parent_path = self._stack[-1]
+                    if parent_is_object and parent_path is not None and self._key is not None:
+                        path = parent_path + (self._key,)
+                if not is_object and self._state == _PREFIX and path == self.path:
+                    self._state = _ITEMS
+                    entered = True
+                    break
+                self._stack.append((is_object, path))
+                self._expect_key = is_object
+            elif char == "}" or char == "]":
+                if self._stack:
+                    self._stack.pop()
+                self._expect_key = False
+            elif char == ",":
+                self._expect_key = bool(self._stack) and self._stack[-1][0]
+
+        self._envelope.append(buffer[start:pos])
+        self._pos = pos
+        return entered
+
+    def _read_items(self, items: List[Any], final: bool) -> bool:
+        """
+        Decode complete items of the array
+        """
+        buffer = self._buffer
+        pos = self._pos
+        length = len(buffer)
+        try:
+            while True:
+                pos = _WHITESPACE.match(buffer, pos).end()  # type: ignore[union-attr]
+                if pos >= length:
+                    return False
+                char = buffer[pos]
+                if char == ",":
+                    pos += 1
+                    continue
+                if char == "]":
+                    self._state = _SUFFIX
+                    self._envelope.append("]")
+                    pos += 1
+                    return True
+                try:
+                    item, end = self._json.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    # Item is not complete yet
+                    return False
+                if end >= length and not final:
+                    # Numbers can be continued by the next chunk
+                    return False
+                items.append(item)
+                pos = end
+        finally:
+            self._pos = pos
+
+    @staticmethod
+    def _find_string_end(buffer: str, pos: int) -> Optional[int]:
+        while True:
+            match = _STRING_SPECIAL.search(buffer, pos)
+            if match is None:
+                return None
+            if match.group() == '"':
+                return match.start()
+            pos = match.start() + 2
+            if pos > len(buffer):
+                return None
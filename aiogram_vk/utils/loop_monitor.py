@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import suppress
+from typing import Any, Deque, Dict, Optional
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag: the monitor sleeps for the interval and checks
+    how late it is woken up. Lag grows when the loop is busy with CPU-bound work
+    (decoding, validation, handlers), while slow responses of Vk don't affect it.
+
+    .. code-block:: python
+
+        monitor = LoopMonitor(interval=0.25)
+        monitor.start()
+        ...
+        monitor.as_dict()  # {"lag": 0.0004, "max_lag": 0.12, ...}
+    """
+
+    def __init__(self, interval: float = 0.5, window: int = 120) -> None:
+        """
+        :param interval: Time between the measurements in seconds
+        :param window: Number of the last measurements used for :code:`max_lag` and :code:`avg_lag`
+        """
+        self.interval = interval
+        self.lags: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """
+        Start the monitor in the running event loop, does nothing when it is already started
+        """
+        loop = asyncio.get_running_loop()
+        if self.running and self._task is not None and self._task.get_loop() is loop:
+            return
+        self.lags.clear()
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        if task.done() or task.get_loop() is not asyncio.get_running_loop():
+            # Task of another event loop is stopped with that loop
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(time.monotonic() - expected, 0.0))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        :return: :code:`lag` - last lag, :code:`max_lag` and :code:`avg_lag` - over the window,
+            in seconds, None before the first measurement
+        """
+        lags = self.lags
+        return {
+            "running": self.running,
+            "lag": lags[-1] if lags else None,
+            "max_lag": max(lags) if lags else None,
+            "avg_lag": sum(lags) / len(lags) if lags else None,
+        }
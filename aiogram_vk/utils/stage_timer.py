@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+
+class StageTimer:
+    """
+    Breakdown of the request time by stages.
+
+    Every mark closes the stage started by the previous mark (or by the timer creation),
+    time of the repeated stages is summed up.
+    """
+
+    __slots__ = ("started", "last", "stages")
+
+    def __init__(self) -> None:
+        self.started = self.last = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        self.stages[name] = self.stages.get(name, 0.0) + now - self.last
+        self.last = now
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+_current_timer: ContextVar[Optional[StageTimer]] = ContextVar("stage_timer", default=None)
+
+
+def mark_stage(name: str) -> None:
+    """
+    Close the current stage of the request, does nothing when the request is not timed.
+    Called by sessions:
+
+    - :code:`middlewares` - before the request is prepared (time in the middlewares);
+    - :code:`prepare` - after the parameters are prepared;
+    - :code:`network` - after the response is received;
+    - :code:`decode` - after the response is decoded and validated.
+
+    :class:`aiogram_vk.client.session.middlewares.profiling.ProfilingMiddleware`
+    also closes :code:`post` stage when the call returns to it
+    (response handling in the inner middlewares).
+
+    :param name: name of the finished stage
+    """
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.mark(name)
+
+
+@contextmanager
+def stage_timer() -> Iterator[StageTimer]:
+    """
+    Time stages of the requests made in the block
+    """
+    timer = StageTimer()
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, NamedTuple, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class RequestTimeout(NamedTuple):
+    """
+    Timeouts of the request in seconds, None means no limit
+    """
+
+    total: Optional[float] = None
+    "Whole request including connection establishment and reading of the response"
+    connect: Optional[float] = None
+    "Acquiring of the connection from the pool including establishment of the new one"
+    sock_read: Optional[float] = None
+    "Maximal time between two reads of the response"
+
+    @classmethod
+    def of(cls, value: TimeoutType) -> RequestTimeout:
+        """
+        Convert number of seconds to the total timeout
+
+        :param value: timeout or number of seconds
+        """
+        if isinstance(value, RequestTimeout):
+            return value
+        return cls(total=value)
+
+    def cap(self, limit: Optional[float]) -> RequestTimeout:
+        """
+        Limit every timeout
+
+        :param limit: maximal timeout, unlimited when None
+        """
+        if limit is None:
+            return self
+        return RequestTimeout(*(limit if value is None else min(value, limit) for value in self))
+
+    def scale(self, factor: float) -> RequestTimeout:
+        """
+        Multiply total and read timeouts, connection timeout doesn't depend on the response
+
+        :param factor: multiplier
+        """
+        return self._replace(
+            total=None if self.total is None else self.total * factor,
+            sock_read=None if self.sock_read is None else self.sock_read * factor,
+        )
+
+
+TimeoutType = Union[float, RequestTimeout]
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Limit time of all requests made in the block, including retries,
+    requests of the nested calls and tasks created in the block.
+    Timeouts of the requests are reduced to the remaining time,
+    requests made after the deadline fail immediately.
+    Nested block can't extend the deadline of the outer one.
+
+    .. code-block:: python
+
+        with deadline(2.0):
+            count = await bot(audio.GetCount(owner_id=owner_id))
+            tracks = await bot(audio.Get(owner_id=owner_id, count=count))
+
+    :param seconds: time given to the block
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Time left until the current deadline
+
+    :return: seconds, can be negative when the deadline is exceeded, None without deadline
+    """
+    at = _deadline.get()
+    if at is None:
+        return None
+    return at - time.monotonic()
+
+
+async def wait_within_deadline(awaitable: Awaitable[T]) -> T:
+    """
+    Wait for the awaitable not longer than the time left until the current deadline,
+    used by the middlewares queueing the requests
+
+    :param awaitable: awaitable, cancelled when the deadline is exceeded
+    :return: result of the awaitable
+    :raise asyncio.TimeoutError: when the deadline is exceeded
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, timeout=max(remaining, 0))
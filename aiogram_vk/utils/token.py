@@ -1,3 +1,4 @@
+import hashlib
 from functools import lru_cache
 
 
@@ -40,3 +41,14 @@ def extract_bot_id(token: str) -> int:
     validate_token(token)
     raw_bot_id, *_ = token.split(":")
     return int(raw_bot_id)
+
+
+@lru_cache()
+def token_label(token: str) -> str:
+    """
+    Short label of the token for metrics and logs, the token can't be restored from it
+
+    :param token:
+    :return:
+    """
+    return hashlib.blake2b(token.encode(), digest_size=4).hexdigest()
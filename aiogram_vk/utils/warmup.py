@@ -0,0 +1,202 @@
+"""
+Schema warm-up and startup benchmark.
+
+Models are built lazily on the first use, so the first call of every method
+in a new process pays for the validators construction.
+Call :func:`warmup` on startup of the worker to build everything in one pass.
+For pre-fork deployments call :func:`prepare_for_fork` in the parent process
+before workers are forked, so children share built validators copy-on-write.
+
+Startup report (import time profile and first-call latency of every method)
+can be printed with:
+
+.. code-block:: bash
+
+    python -m aiogram_vk.utils.warmup
+"""
+
+from __future__ import annotations
+
+import ast
+import gc
+import inspect
+import re
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Type, TypeVar
+
+T = TypeVar("T", bound=type)
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)$")
+
+
+def iter_subclasses(cls: T) -> Iterator[T]:
+    """
+    Iterate over all concrete subclasses of the class recursively
+
+    :param cls: base class
+    """
+    seen = set()
+    stack = list(cls.__subclasses__())
+    while stack:
+        subclass = stack.pop()
+        if subclass in seen:
+            continue
+        seen.add(subclass)
+        stack.extend(subclass.__subclasses__())
+        if not inspect.isabstract(subclass):
+            yield subclass
+
+
+def iter_methods() -> Iterator[Type[Any]]:
+    """
+    Iterate over all known API methods
+    """
+    from aiogram_vk.methods import VkMethod
+
+    for method in iter_subclasses(VkMethod):
+        if getattr(method, "__pydantic_generic_metadata__", {}).get("origin") is not None:
+            # Parametrized base classes like VkMethod[int]
+            continue
+        yield method
+
+
+def warmup() -> int:
+    """
+    Build validators of every Vk object, method and method response in one pass
+
+    :return: number of built models
+    """
+    from aiogram_vk.methods import get_response_type
+    from aiogram_vk.types import VkObject, rebuild_entities
+    from aiogram_vk.types.custom import parse_datetime, parse_url
+
+    count = rebuild_entities()
+    for entity in iter_subclasses(VkObject):
+        entity.model_rebuild()
+        count += 1
+    for method in iter_methods():
+        method.model_rebuild()
+        get_response_type(method.__returning__).model_rebuild()
+        count += 2
+
+    parse_url("https://vk.com")
+    parse_datetime(0)
+    return count
+
+
+def prepare_for_fork() -> None:
+    """
+    Build everything in the parent process before workers are forked.
+
+    Built validators are moved to the permanent generation of the garbage collector,
+    so collections in children don't touch their memory
+    and it stays shared copy-on-write.
+    """
+    warmup()
+    gc.collect()
+    gc.freeze()
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    level: int
+
+
+def profile_import(module: str = "aiogram_vk") -> List[ImportRecord]:
+    """
+    Profile import of the module in the new interpreter with :code:`-X importtime`
+
+    :param module: module name
+    :return: import records in the order of completion
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        records.append(
+            ImportRecord(
+                module=name,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                level=(len(indent) - 1) // 2,
+            )
+        )
+    return records
+
+
+def measure_first_calls(warm: bool = False) -> Dict[str, float]:
+    """
+    Measure time spent on building validators by the first call of every method
+    in the current process, should be called in the fresh interpreter
+
+    :param warm: call :func:`warmup` before measuring
+    :return: API method name to seconds mapping
+    """
+    from aiogram_vk.methods import get_response_type
+
+    if warm:
+        warmup()
+
+    result = {}
+    for method in iter_methods():
+        started = time.perf_counter()
+        method.model_rebuild()
+        get_response_type(method.__returning__).model_rebuild()
+        result[method.__api_method__] = time.perf_counter() - started
+    return result
+
+
+def _measure_in_subprocess(code: str) -> Any:
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return ast.literal_eval(result.stdout.strip())
+
+
+def main(top: int = 15) -> None:
+    """
+    Print startup report
+
+    :param top: number of the slowest modules to show
+    """
+    records = profile_import()
+    total = next(r for r in reversed(records) if r.module == "aiogram_vk")
+    print(f"Import of aiogram_vk: {total.cumulative_us / 1000:.1f} ms")
+    print(f"Slowest imports (self time), top {top}:")
+    for record in sorted(records, key=lambda r: r.self_us, reverse=True)[:top]:
+        print(
+            f"  {record.self_us / 1000:8.1f} ms  "
+            f"{record.cumulative_us / 1000:8.1f} ms cumulative  {record.module}"
+        )
+
+    warmup_time = _measure_in_subprocess(
+        "import time, aiogram_vk\n"
+        "from aiogram_vk.utils.warmup import warmup\n"
+        "started = time.perf_counter(); warmup(); print(time.perf_counter() - started)"
+    )
+    print(f"Warm-up: {warmup_time * 1000:.1f} ms")
+
+    for warm in (False, True):
+        timings = _measure_in_subprocess(
+            "from aiogram_vk.utils.warmup import measure_first_calls\n"
+            f"print(measure_first_calls(warm={warm}))"
+        )
+        print(f"First call latency ({'after' if warm else 'without'} warm-up):")
+        for api_method, seconds in timings.items():
+            print(f"  {seconds * 1000:8.2f} ms  {api_method}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
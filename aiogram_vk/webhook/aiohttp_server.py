@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Set
+
+from aiohttp import web
+from aiohttp.abc import Application
+from pydantic import ValidationError
+
+from aiogram_vk import loggers
+from aiogram_vk.client.bot import VkBot
+from aiogram_vk.dispatcher import Dispatcher
+from aiogram_vk.types import Update
+
+CONFIRMATION = "confirmation"
+
+
+def setup_application(app: Application, dispatcher: Dispatcher, /, **kwargs: Any) -> None:
+    """
+    This function helps to configure a startup-shutdown process:
+    workers of the dispatcher are started with the application
+    and queued updates are handled before it is stopped
+
+    :param app: aiohttp application
+    :param dispatcher: aiogram_vk dispatcher
+    :param kwargs: additional arguments of :meth:`Dispatcher.stop_workers`
+    :return:
+    """
+
+    async def on_startup(*a: Any, **kw: Any) -> None:  # pragma: no cover
+        dispatcher.start_workers()
+
+    async def on_shutdown(*a: Any, **kw: Any) -> None:  # pragma: no cover
+        await dispatcher.stop_workers(**kwargs)
+
+    app.on_startup.append(on_startup)
+    app.on_shutdown.append(on_shutdown)
+
+
+class BaseRequestHandler(ABC):
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        handle_in_background: bool = True,
+        max_background_tasks: int = 1024,
+    ) -> None:
+        """
+        Base handler that helps to handle incoming Callback API request from aiohttp
+        and propagate it to the Dispatcher
+
+        :param dispatcher: instance of :class:`aiogram_vk.dispatcher.Dispatcher`
+        :param handle_in_background: immediately responds to Vk instead of
+            waiting for the free place in the dispatcher queue
+        :param max_background_tasks: Maximum number of updates waiting for the free place
+            in the dispatcher queue in background, Vk gets 503 response above it
+            and resends the event later
+        """
+        self.dispatcher = dispatcher
+        self.handle_in_background = handle_in_background
+        self.max_background_tasks = max_background_tasks
+        self._background_feed_update_tasks: Set[asyncio.Task[Any]] = set()
+        self._closing = False
+
+    def register(self, app: Application, /, path: str, **kwargs: Any) -> None:
+        """
+        Register route and shutdown callback
+
+        :param app: instance of aiohttp Application
+        :param path: route path
+        :param kwargs:
+        """
+        app.on_shutdown.append(self._handle_shutdown)
+        app.on_cleanup.append(self._handle_close)
+        app.router.add_route("POST", path, self.handle, **kwargs)
+
+    async def _handle_shutdown(self, *a: Any, **kw: Any) -> None:
+        # Updates accepted by the server should reach the dispatcher queue,
+        # new ones are rejected, so Vk resends them after restart
+        self._closing = True
+        if self._background_feed_update_tasks:
+            await asyncio.gather(*self._background_feed_update_tasks, return_exceptions=True)
+
+    async def _handle_close(self, *a: Any, **kw: Any) -> None:
+        await self.close()
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def resolve_bot(self, group_id: Optional[int]) -> Optional[VkBot]:
+        """
+        Resolve Bot instance for the community
+
+        :param group_id: community ID from the request
+        :return: Bot instance or None if the community is unknown
+        """
+        pass
+
+    @abstractmethod
+    def get_confirmation_code(self, group_id: Optional[int]) -> Optional[str]:
+        """
+        Get string the server should return to confirm its address
+
+        :param group_id: community ID from the request
+        """
+        pass
+
+    @abstractmethod
+    def verify_secret(self, secret: str, group_id: Optional[int]) -> bool:
+        pass
+
+    def json_loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+    async def _background_feed_update(self, bot: VkBot, update: Update) -> None:
+        await self.dispatcher.feed_update(bot, update)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if self._closing:
+            return web.Response(body="Service Unavailable", status=503)
+        body = await request.read()
+        try:
+            data = self.json_loads(body)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            loggers.webhook.warning("Malformed Callback API request: %r", body[:256])
+            return web.Response(body="Bad Request", status=400)
+
+        group_id = data.get("group_id")
+        secret = data.pop("secret", None)
+        if not self.verify_secret(secret if isinstance(secret, str) else "", group_id):
+            loggers.webhook.warning("Blocking request with invalid secret for group %s", group_id)
+            return web.Response(body="Unauthorized", status=401)
+
+        bot = self.resolve_bot(group_id)
+        if bot is None:
+            loggers.webhook.warning("Callback API request for unknown group %s", group_id)
+            return web.Response(body="Not Found", status=404)
+
+        if data.get("type") == CONFIRMATION:
+            code = self.get_confirmation_code(group_id)
+            if code is None:
+                return web.Response(body="Not Found", status=404)
+            return web.Response(text=code)
+
+        try:
+            update = Update.model_validate(data, context={"bot": bot})
+        except ValidationError as e:
+            loggers.webhook.warning("Invalid Callback API update: %s", e)
+            return web.Response(body="Bad Request", status=400)
+
+        if self.handle_in_background:
+            if len(self._background_feed_update_tasks) >= self.max_background_tasks:
+                loggers.webhook.warning(
+                    "Too many updates are waiting for the dispatcher, "
+                    "rejecting update %s of group %s",
+                    update.event_id,
+                    group_id,
+                )
+                return web.Response(body="Service Unavailable", status=503)
+            feed_update_task = asyncio.create_task(self._background_feed_update(bot, update))
+            self._background_feed_update_tasks.add(feed_update_task)
+            feed_update_task.add_done_callback(self._background_feed_update_tasks.discard)
+        else:
+            await self.dispatcher.feed_update(bot, update)
+        # Vk resends the event until "ok" is received
+        return web.Response(text="ok")
+
+    __call__ = handle
+
+
+class SimpleRequestHandler(BaseRequestHandler):
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: VkBot,
+        confirmation_code: str,
+        secret: Optional[str] = None,
+        group_id: Optional[int] = None,
+        handle_in_background: bool = True,
+        max_background_tasks: int = 1024,
+    ) -> None:
+        """
+        Callback API handler for single Bot instance
+
+        .. code-block:: python
+
+            app = web.Application()
+            SimpleRequestHandler(dp, bot, confirmation_code="...", secret="...").register(
+                app, path="/callback"
+            )
+            setup_application(app, dp)
+            web.run_app(app)
+
+        :param dispatcher: instance of :class:`aiogram_vk.dispatcher.Dispatcher`
+        :param bot: instance of :class:`aiogram_vk.client.bot.VkBot`
+        :param confirmation_code: string the server should return to confirm its address
+        :param secret: secret key from the Callback API settings of the community
+        :param group_id: accept requests only for this community
+        :param handle_in_background: immediately responds to Vk instead of
+            waiting for the free place in the dispatcher queue
+        :param max_background_tasks: Maximum number of updates waiting for the free place
+            in the dispatcher queue in background, Vk gets 503 response above it
+            and resends the event later
+        """
+        super().__init__(
+            dispatcher=dispatcher,
+            handle_in_background=handle_in_background,
+            max_background_tasks=max_background_tasks,
+        )
+        self.bot = bot
+        self.confirmation_code = confirmation_code
+        self.secret = secret
+        self.group_id = group_id
+
+    def json_loads(self, data: bytes) -> Any:
+        return self.bot.session.json_loads(data)
+
+    def verify_secret(self, secret: str, group_id: Optional[int]) -> bool:
+        if self.secret:
+            return hmac.compare_digest(secret.encode(), self.secret.encode())
+        return True
+
+    def resolve_bot(self, group_id: Optional[int]) -> Optional[VkBot]:
+        if self.group_id is not None and group_id != self.group_id:
+            return None
+        return self.bot
+
+    def get_confirmation_code(self, group_id: Optional[int]) -> Optional[str]:
+        return self.confirmation_code
+
+    async def close(self) -> None:
+        """
+        Close bot session
+        """
+        await self.bot.session.close()
+
+
+class GroupBasedRequestHandler(BaseRequestHandler):
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        handle_in_background: bool = True,
+        max_background_tasks: int = 1024,
+    ) -> None:
+        """
+        Callback API handler for several communities on the same path,
+        the community is resolved from :code:`group_id` of the request
+
+        :param dispatcher: instance of :class:`aiogram_vk.dispatcher.Dispatcher`
+        :param handle_in_background: immediately responds to Vk instead of
+            waiting for the free place in the dispatcher queue
+        :param max_background_tasks: Maximum number of updates waiting for the free place
+            in the dispatcher queue in background, Vk gets 503 response above it
+            and resends the event later
+        """
+        super().__init__(
+            dispatcher=dispatcher,
+            handle_in_background=handle_in_background,
+            max_background_tasks=max_background_tasks,
+        )
+        self.groups: Dict[int, Dict[str, Any]] = {}
+
+    def add_group(
+        self,
+        group_id: int,
+        bot: VkBot,
+        confirmation_code: str,
+        secret: Optional[str] = None,
+    ) -> None:
+        """
+        Add community
+
+        :param group_id: community ID
+        :param bot: instance of :class:`aiogram_vk.client.bot.VkBot`
+        :param confirmation_code: string the server should return to confirm its address
+        :param secret: secret key from the Callback API settings of the community
+        """
+        self.groups[group_id] = {
+            "bot": bot,
+            "confirmation_code": confirmation_code,
+            "secret": secret,
+        }
+
+    def _get_group(self, group_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        if group_id is None:
+            return None
+        return self.groups.get(group_id)
+
+    def verify_secret(self, secret: str, group_id: Optional[int]) -> bool:
+        group = self._get_group(group_id)
+        if group is None:
+            # Unknown community is rejected by resolve_bot
+            return True
+        if group["secret"]:
+            return hmac.compare_digest(secret.encode(), group["secret"].encode())
+        return True
+
+    def resolve_bot(self, group_id: Optional[int]) -> Optional[VkBot]:
+        group = self._get_group(group_id)
+        return None if group is None else group["bot"]
+
+    def get_confirmation_code(self, group_id: Optional[int]) -> Optional[str]:
+        group = self._get_group(group_id)
+        return None if group is None else group["confirmation_code"]
+
+    async def close(self) -> None:
+        """
+        Close sessions of all bots
+        """
+        sessions = {
+            id(group["bot"].session): group["bot"].session for group in self.groups.values()
+        }
+        for session in sessions.values():
+            await session.close()